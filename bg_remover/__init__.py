@@ -6,8 +6,16 @@ __version__ = "1.0.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from .core.processor import BackgroundProcessor
-from .core.monitor import FolderMonitor
 from .config.manager import ConfigManager
 
 __all__ = ["BackgroundProcessor", "FolderMonitor", "ConfigManager"]
+
+def __getattr__(name):
+    """Lazily import the processing stack so light entry points (CLI config commands) start fast"""
+    if name == "BackgroundProcessor":
+        from .core.processor import BackgroundProcessor
+        return BackgroundProcessor
+    if name == "FolderMonitor":
+        from .core.monitor import FolderMonitor
+        return FolderMonitor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,12 @@
+import ast
+import os
+import queue
+import re
 import sys
 import signal
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 import click
@@ -8,24 +14,55 @@ import logging
 from tqdm import tqdm
 
 from ..config.manager import ConfigManager
-from ..core.processor import BackgroundProcessor
-from ..core.monitor import FolderMonitor
-from ..models.factory import ModelFactory
 from ..utils.logging_setup import setup_logging
-from ..utils.device_utils import get_system_info, detect_device
+from ..utils.file_utils import scan_images
 
 logger = logging.getLogger(__name__)
 
+# Model stack (processor, monitor, model backends, torch-touching utils) is
+# imported inside the commands that need it to keep CLI startup fast
+
+class ModelChoice(click.Choice):
+    """Choice of model names resolved from ModelFactory on first use"""
+    
+    def __init__(self):
+        super().__init__([])
+    
+    @property
+    def choices(self):
+        """Get available model names (imports the model stack on first access)"""
+        if self._choices is None:
+            from ..models.factory import ModelFactory
+            self._choices = tuple(ModelFactory.get_available_models())
+        return self._choices
+    
+    @choices.setter
+    def choices(self, value):
+        self._choices = tuple(value) or None
+
+# Output file stem: originalname_model_quality_device, optionally followed by
+# _<time>s when processing.include_time_in_filename is set
+_RESULT_NAME_PATTERN = re.compile(r'^(.*)_([^_]+)_([^_]+)_([^_]+)$')
+_RESULT_TIME_SUFFIX = re.compile(r'_\d+(?:\.\d+)?s$')
+
+# Model batches merged into one process_batch call when monitor batches pile up
+MONITOR_MERGE_BATCHES = 4
+
+# Model names are resolved once and shared by all option decorators
+_AVAILABLE_MODELS = ModelChoice()
+
 # Global variables for graceful shutdown
 processor = None
 monitor = None
 shutdown_requested = False
+_shutdown_event = threading.Event()
 
 def signal_handler(signum, frame):
     """Handle shutdown signals"""
     global shutdown_requested, processor, monitor
     
     shutdown_requested = True
+    _shutdown_event.set()
     click.echo("\nShutdown requested...")
     
     if processor:
@@ -40,6 +77,23 @@ def signal_handler(signum, frame):
 signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 
+def _scan_input_files(config, input_folder) -> list:
+    """Collect supported files in a folder with a single directory pass
+    
+    Args:
+        config: Configuration manager
+        input_folder: Folder to scan
+        
+    Returns:
+        List of supported file paths (empty if the folder doesn't exist)
+    """
+    folder_path = Path(input_folder)
+    if not folder_path.is_dir():
+        return []
+    
+    extensions = config.get('processing.file_extensions', [])
+    return [Path(path) for path in scan_images(folder_path, extensions)]
+
 @click.group()
 @click.option('--config', '-c', help='Configuration file path')
 @click.option('--log-level', default='INFO', type=click.Choice(['DEBUG', 'INFO', 'WARNING', 'ERROR']))
@@ -68,15 +122,16 @@ def cli(ctx, config, log_level, log_file):
 @cli.command()
 @click.option('--input', '-i', help='Input folder path')
 @click.option('--output', '-o', help='Output folder path')
-@click.option('--model', '-m', help='Model to use', type=click.Choice(ModelFactory.get_available_models()))
+@click.option('--model', '-m', help='Model to use', type=_AVAILABLE_MODELS)
 @click.option('--device', type=click.Choice(['auto', 'cpu', 'cuda']), help='Device to use')
 @click.option('--batch-size', type=int, help='Batch size for parallel processing')
+@click.option('--auto-batch', is_flag=True, help='Derive batch size from CPU count and number of files')
 @click.option('--quality', type=click.Choice(['low', 'medium', 'high']), help='Processing quality')
 @click.option('--overwrite', is_flag=True, help='Overwrite existing output files')
 @click.option('--format', type=click.Choice(['png', 'jpg', 'jpeg']), help='Output format')
 
 @click.pass_context
-def process(ctx, input, output, model, device, batch_size, quality, overwrite, format):
+def process(ctx, input, output, model, device, batch_size, auto_batch, quality, overwrite, format):
     """Process all images in a folder"""
     
     config = ctx.obj['config']
@@ -92,6 +147,8 @@ def process(ctx, input, output, model, device, batch_size, quality, overwrite, f
         config.set('processing.device', device)
     if batch_size:
         config.set('processing.batch_size', batch_size)
+    if auto_batch:
+        config.set('processing.batch_size', 0)
     if quality:
         config.set(f'models.{config.get("processing.model")}.quality', quality)
     if overwrite:
@@ -99,6 +156,9 @@ def process(ctx, input, output, model, device, batch_size, quality, overwrite, f
     if format:
         config.set('processing.output_format', format)
     
+    from ..core.processor import BackgroundProcessor
+    from ..utils.device_utils import detect_device
+    
     # Initialize processor
     global processor
     processor = BackgroundProcessor(config)
@@ -106,24 +166,27 @@ def process(ctx, input, output, model, device, batch_size, quality, overwrite, f
     # Progress tracking
     progress_bar = None
     processed_files = []
+    # Called from the processor's encode threads
+    progress_lock = threading.Lock()
     
     def progress_callback(input_path, output_path, success, processing_time):
         nonlocal progress_bar, processed_files
         
-        processed_files.append({
-            'input': input_path,
-            'output': output_path,
-            'success': success,
-            'time': processing_time
-        })
-        
-        if progress_bar:
-            progress_bar.update(1)
-            if success:
-                progress_bar.set_postfix({
-                    'current': input_path.name,
-                    'time': f'{processing_time:.2f}s'
-                })
+        with progress_lock:
+            processed_files.append({
+                'input': input_path,
+                'output': output_path,
+                'success': success,
+                'time': processing_time
+            })
+            
+            if progress_bar:
+                progress_bar.update(1)
+                if success:
+                    progress_bar.set_postfix({
+                        'current': input_path.name,
+                        'time': f'{processing_time:.2f}s'
+                    })
     
     try:
         # Get input folder
@@ -132,13 +195,9 @@ def process(ctx, input, output, model, device, batch_size, quality, overwrite, f
         click.echo(f"Model: {config.get('processing.model')}")
         click.echo(f"Device: {detect_device()}")
         
-        # Count files first
-        folder_path = Path(input_folder)
-        extensions = config.get('processing.file_extensions', [])
-        total_files = 0
-        for ext in extensions:
-            total_files += len(list(folder_path.glob(f"*{ext}")))
-            total_files += len(list(folder_path.glob(f"*{ext.upper()}")))
+        # Collect files once; the same list is handed to the processor
+        ctx.obj['files'] = _scan_input_files(config, input_folder)
+        total_files = len(ctx.obj['files'])
         
         if total_files == 0:
             click.echo("No supported image files found.")
@@ -148,9 +207,9 @@ def process(ctx, input, output, model, device, batch_size, quality, overwrite, f
         progress_bar = tqdm(total=total_files, desc="Processing", unit="files")
         
         # Process folder
-        start_time = time.time()
-        results = processor.process_folder(input_folder, progress_callback)
-        end_time = time.time()
+        start_time = time.perf_counter()
+        results = processor.process_folder(input_folder, progress_callback, files=ctx.obj['files'])
+        end_time = time.perf_counter()
         
         # Close progress bar
         progress_bar.close()
@@ -177,7 +236,7 @@ def process(ctx, input, output, model, device, batch_size, quality, overwrite, f
 
 @cli.command()
 @click.option('--input', '-i', help='Input folder to monitor')
-@click.option('--model', '-m', help='Model to use', type=click.Choice(ModelFactory.get_available_models()))
+@click.option('--model', '-m', help='Model to use', type=_AVAILABLE_MODELS)
 @click.option('--device', type=click.Choice(['auto', 'cpu', 'cuda']), help='Device to use')
 @click.option('--recursive', is_flag=True, help='Monitor subdirectories recursively')
 @click.option('--process-existing', is_flag=True, help='Process existing files before monitoring')
@@ -201,6 +260,10 @@ def monitor(ctx, input, model, device, recursive, process_existing, new_only, fo
     if format:
         config.set('processing.output_format', format)
     
+    from ..core.processor import BackgroundProcessor
+    from ..core.monitor import FolderMonitor
+    from ..utils.device_utils import detect_device
+    
     # Initialize components
     global processor, monitor
     processor = BackgroundProcessor(config)
@@ -221,25 +284,53 @@ def monitor(ctx, input, model, device, recursive, process_existing, new_only, fo
             results = processor.process_folder(input_folder, progress_callback)
             click.echo(f"Initial processing: {results['processed']} processed, {results['failed']} failed\n")
     
-    def process_file_callback(file_path):
-        """Callback for processing new files"""
-        try:
-            if not file_path.exists():
-                return
-                
+    # Debounced batches from the monitor are queued and processed one after another
+    batch_queue = queue.Queue()
+    
+    def process_file_callback(file_paths):
+        """Callback for queueing new files"""
+        for file_path in file_paths:
             click.echo(f"New file detected: {file_path}")
-            results = processor.process_batch([file_path])
+        batch_queue.put(file_paths)
+    
+    def batch_progress_callback(input_path, output_path, success, processing_time):
+        if success:
+            click.echo(f"Successfully processed: {input_path}")
+        else:
+            click.echo(f"Failed to process: {input_path}")
+    
+    # Queued batches that piled up are merged, up to a few model batches per pass
+    merge_limit = (config.get('processing.batch_size', 1) or os.cpu_count() or 1) * MONITOR_MERGE_BATCHES
+    
+    def batch_worker():
+        """Process queued batches, merging any that piled up meanwhile"""
+        carry = []  # files left over from the previous pass, processed first
+        while not _shutdown_event.is_set():
+            if not carry:
+                try:
+                    carry = list(batch_queue.get(timeout=1.0))
+                except queue.Empty:
+                    continue
             
-            if results['processed'] > 0:
-                click.echo(f"Successfully processed: {file_path}")
-            else:
-                click.echo(f"Failed to process: {file_path}")
-                
-        except Exception as e:
-            click.echo(f"Error processing {file_path}: {e}")
-            logger.error(f"Monitor processing error: {e}", exc_info=True)
+            while len(carry) < merge_limit:
+                try:
+                    carry.extend(batch_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            batch, carry = carry[:merge_limit], carry[merge_limit:]
+            
+            # Trust the watcher; files removed before the flush drop out in process_batch
+            try:
+                processor.process_batch(batch, batch_progress_callback)
+            except FileNotFoundError as e:
+                logger.debug(f"File vanished before processing: {e}")
+            except Exception as e:
+                click.echo(f"Error processing batch of {len(batch)} files: {e}")
+                logger.error(f"Monitor processing error: {e}", exc_info=True)
 
     monitor = FolderMonitor(config, process_file_callback)
+    threading.Thread(target=batch_worker, name="monitor-batch-worker", daemon=True).start()
     
     try:
         click.echo(f"Starting folder monitoring: {input_folder}")
@@ -251,12 +342,12 @@ def monitor(ctx, input, model, device, recursive, process_existing, new_only, fo
         # Start monitoring
         monitor.start_monitoring()
         
-        # Keep running until interrupted
-        while not shutdown_requested:
-            time.sleep(1)
-            
-            # Show periodic statistics
-            if processor.stats.total_files > 0:
+        # Keep running until interrupted, refreshing statistics only when they change
+        last_total = -1
+        while not _shutdown_event.wait(timeout=5.0):
+            total_files = processor.stats.total_files
+            if total_files > 0 and total_files != last_total:
+                last_total = total_files
                 stats = processor.get_statistics()
                 click.echo(f"\rProcessed: {stats['total_processed']}, "
                           f"Failed: {stats['total_failed']}, "
@@ -269,54 +360,66 @@ def monitor(ctx, input, model, device, recursive, process_existing, new_only, fo
         logger.error(f"Monitoring error: {e}", exc_info=True)
         sys.exit(1)
     finally:
+        _shutdown_event.set()
         if monitor:
             monitor.stop_monitoring()
+        processor.shutdown()
 
 @cli.command()
 @click.pass_context
 def info(ctx):
     """Show system and configuration information"""
     
+    from ..utils.device_utils import get_system_info
+    
     config = ctx.obj['config']
     
-    click.echo("=== BG Remover System Information ===")
+    lines = ["=== BG Remover System Information ==="]
     
     # System info
     sys_info = get_system_info()
-    click.echo(f"\nSystem:")
-    click.echo(f"  Platform: {sys_info.get('platform', 'Unknown')}")
-    click.echo(f"  Python: {sys_info.get('python_version', 'Unknown')}")
-    click.echo(f"  CPU Count: {sys_info.get('cpu_count', 'Unknown')}")
-    click.echo(f"  Total Memory: {sys_info.get('total_memory_gb', 'Unknown')} GB")
-    click.echo(f"  Available Memory: {sys_info.get('available_memory_gb', 'Unknown')} GB")
+    lines.extend([
+        "\nSystem:",
+        f"  Platform: {sys_info.get('platform', 'Unknown')}",
+        f"  Python: {sys_info.get('python_version', 'Unknown')}",
+        f"  CPU Count: {sys_info.get('cpu_count', 'Unknown')}",
+        f"  Total Memory: {sys_info.get('total_memory_gb', 'Unknown')} GB",
+        f"  Available Memory: {sys_info.get('available_memory_gb', 'Unknown')} GB",
+    ])
     
     # PyTorch info
     if 'torch_version' in sys_info:
-        click.echo(f"\nPyTorch:")
-        click.echo(f"  Version: {sys_info['torch_version']}")
-        click.echo(f"  CUDA Available: {sys_info['torch_cuda_available']}")
+        lines.extend([
+            "\nPyTorch:",
+            f"  Version: {sys_info['torch_version']}",
+            f"  CUDA Available: {sys_info['torch_cuda_available']}",
+        ])
         if sys_info['torch_cuda_available']:
-            click.echo(f"  CUDA Version: {sys_info.get('torch_cuda_version', 'Unknown')}")
-            click.echo(f"  CUDA Devices: {sys_info.get('torch_cuda_device_count', 0)}")
+            lines.append(f"  CUDA Version: {sys_info.get('torch_cuda_version', 'Unknown')}")
+            lines.append(f"  CUDA Devices: {sys_info.get('torch_cuda_device_count', 0)}")
     
     # Available models
-    click.echo(f"\nAvailable Models:")
-    for model_name in ModelFactory.get_available_models():
+    lines.append("\nAvailable Models:")
+    for model_name in _AVAILABLE_MODELS.choices:
         enabled = config.get(f'models.{model_name}.enabled', False)
         status = "✓" if enabled else "✗"
-        click.echo(f"  {status} {model_name}")
+        lines.append(f"  {status} {model_name}")
     
     # Configuration
-    click.echo(f"\nConfiguration:")
-    click.echo(f"  Config File: {config.config_path}")
-    click.echo(f"  Input Folder: {config.get('processing.input_folder')}")
-    click.echo(f"  Output Folder: {config.get('processing.output_folder')}")
-    click.echo(f"  Current Model: {config.get('processing.model')}")
-    click.echo(f"  Device: {config.get('processing.device')}")
-    click.echo(f"  Monitoring Enabled: {config.get('monitoring.enabled')}")
+    lines.extend([
+        "\nConfiguration:",
+        f"  Config File: {config.config_path}",
+        f"  Input Folder: {config.get('processing.input_folder')}",
+        f"  Output Folder: {config.get('processing.output_folder')}",
+        f"  Current Model: {config.get('processing.model')}",
+        f"  Device: {config.get('processing.device')}",
+        f"  Monitoring Enabled: {config.get('monitoring.enabled')}",
+    ])
+    
+    click.echo("\n".join(lines))
 
 @cli.command()
-@click.option('--model', '-m', help='Model to test', type=click.Choice(ModelFactory.get_available_models()))
+@click.option('--model', '-m', help='Model to test', type=_AVAILABLE_MODELS)
 @click.option('--device', type=click.Choice(['auto', 'cpu', 'cuda']), help='Device to use')
 @click.pass_context
 def test(ctx, model, device):
@@ -333,13 +436,15 @@ def test(ctx, model, device):
     model_name = config.get('processing.model')
     click.echo(f"Testing model: {model_name}")
     
+    from ..core.processor import BackgroundProcessor
+    
     try:
         # Create a test processor
         processor = BackgroundProcessor(config)
         
         # Try to initialize the model
         click.echo("Initializing model...")
-        processor._initialize_model()
+        processor._initialize_model(in_process=True)
         
         click.echo(f"✓ Model '{model_name}' initialized successfully on {processor.model.device}")
         
@@ -373,6 +478,8 @@ def compare(ctx, input, output, models, qualities):
     if output:
         config.set('processing.output_folder', output)
     
+    from ..core.processor import BackgroundProcessor
+    
     # Parse models and qualities
     model_list = [m.strip() for m in models.split(',')]
     quality_list = [q.strip() for q in qualities.split(',')]
@@ -395,33 +502,40 @@ def compare(ctx, input, output, models, qualities):
         total_combinations = len(model_list) * len(quality_list)
         current_combo = 0
         
+        # Originals stay in place during comparisons, so scan the folder once for all runs
+        files = _scan_input_files(config, input_folder)
+        
         for model in model_list:
-            if model not in ModelFactory.get_available_models():
+            if model not in _AVAILABLE_MODELS.choices:
                 click.echo(f"Warning: Model '{model}' not available, skipping")
                 continue
                 
-            for quality in quality_list:
-                current_combo += 1
-                click.echo(f"\n[{current_combo}/{total_combinations}] Testing {model} with {quality} quality...")
-                
-                # Update configuration
-                config.set('processing.model', model)
-                config.set(f'models.{model}.quality', quality)
-                
-                # Initialize processor
-                processor = BackgroundProcessor(config)
-                
-                # Progress tracking
-                def progress_callback(input_path, output_path, success, processing_time):
-                    if success:
-                        click.echo(f"  ✓ {input_path.name} -> {output_path.name} ({processing_time:.2f}s)")
-                    else:
-                        click.echo(f"  ✗ Failed: {input_path.name}")
-                
-                # Process folder
-                results = processor.process_folder(input_folder, progress_callback)
-                
-                click.echo(f"  Results: {results['processed']} processed, {results['failed']} failed, {results['skipped']} skipped")
+            # One processor and loaded model per model, reused across its quality sweep
+            config.set('processing.model', model)
+            processor = BackgroundProcessor(config)
+            
+            try:
+                for quality in quality_list:
+                    current_combo += 1
+                    click.echo(f"\n[{current_combo}/{total_combinations}] Testing {model} with {quality} quality...")
+                    
+                    # Update configuration
+                    processor.set_quality(quality)
+                    processor._initialize_model()
+                    
+                    # Progress tracking
+                    def progress_callback(input_path, output_path, success, processing_time):
+                        if success:
+                            click.echo(f"  ✓ {input_path.name} -> {output_path.name} ({processing_time:.2f}s)")
+                        else:
+                            click.echo(f"  ✗ Failed: {input_path.name}")
+                    
+                    # Process folder
+                    results = processor.process_folder(input_folder, progress_callback, files=files)
+                    
+                    click.echo(f"  Results: {results['processed']} processed, {results['failed']} failed, {results['skipped']} skipped")
+            finally:
+                processor._cleanup_model(release_shared=True)
         
         # After ALL comparisons are done, handle original files according to user's preference
         if original_preserve:
@@ -468,43 +582,48 @@ def analyze_results(ctx, output):
     # Group files by original image
     results = {}
     
-    for file_path in output_folder.glob("*.png"):
-        # Parse filename: originalname_model_quality_device_time.png
-        parts = file_path.stem.split('_')
-        if len(parts) >= 4:
-            original_name = '_'.join(parts[:-3])  # Handle original names with underscores
-            model = parts[-3]
-            quality = parts[-2]
-            device = parts[-1]
+    with os.scandir(output_folder) as it:
+        entries = [entry for entry in it if entry.name.endswith('.png') and entry.is_file()]
+    
+    # Collect file sizes in parallel (stat is I/O bound)
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        sizes = executor.map(lambda entry: entry.stat().st_size, entries)
+    
+    for entry, size in zip(entries, sizes):
+        # Parse filename: originalname_model_quality_device[_time].png
+        match = _RESULT_NAME_PATTERN.match(_RESULT_TIME_SUFFIX.sub('', entry.name[:-4]))
+        if match:
+            # Original names may contain underscores
+            original_name, model, quality, device = match.groups()
             
             if original_name not in results:
                 results[original_name] = []
             
-            file_size = file_path.stat().st_size / 1024 / 1024  # MB
+            file_size = size / 1024 / 1024  # MB
             results[original_name].append({
                 'model': model,
                 'quality': quality,
                 'device': device,
                 'file_size_mb': file_size,
-                'file_path': file_path
+                'file_path': Path(entry.path)
             })
     
     # Display results
     click.echo("=== Processing Results Analysis ===\n")
     
     for original_name, variants in results.items():
-        click.echo(f"Original: {original_name}")
+        lines = [f"Original: {original_name}"]
         
         # Sort by model and quality
         variants.sort(key=lambda x: (x['model'], x['quality']))
         
         for variant in variants:
-            click.echo(f"  {variant['model']:20} {variant['quality']:8} {variant['device']:8} {variant['file_size_mb']:6.2f}MB")
+            lines.append(f"  {variant['model']:20} {variant['quality']:8} {variant['device']:8} {variant['file_size_mb']:6.2f}MB")
         
-        click.echo()
+        lines.append("")
+        click.echo("\n".join(lines))
     
     # Summary statistics
-    click.echo("=== Summary ===")
     models = set()
     qualities = set()
     total_files = 0
@@ -515,23 +634,40 @@ def analyze_results(ctx, output):
             qualities.add(variant['quality'])
             total_files += 1
     
-    click.echo(f"Total processed files: {total_files}")
-    click.echo(f"Models tested: {', '.join(sorted(models))}")
-    click.echo(f"Qualities tested: {', '.join(sorted(qualities))}")
+    click.echo("\n".join([
+        "=== Summary ===",
+        f"Total processed files: {total_files}",
+        f"Models tested: {', '.join(sorted(models))}",
+        f"Qualities tested: {', '.join(sorted(qualities))}",
+    ]))
 
 @cli.command()
+@click.option('--format', type=click.Choice(['yaml', 'json']), default='yaml', help='Output format')
 @click.pass_context
-def config_show(ctx):
+def config_show(ctx, format):
     """Show current configuration"""
     
     config = ctx.obj['config']
     
-    click.echo("=== Current Configuration ===")
-    click.echo(f"Config file: {config.config_path}")
-    click.echo()
-    
-    import yaml
-    click.echo(yaml.dump(config.config, default_flow_style=False, indent=2))
+    if format == 'json':
+        try:
+            import orjson
+            dumped = orjson.dumps(config.config, option=orjson.OPT_INDENT_2).decode()
+        except ImportError:
+            import json
+            dumped = json.dumps(config.config, indent=2, ensure_ascii=False)
+    else:
+        import yaml
+        # LibYAML-backed dumper when available
+        dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+        dumped = yaml.dump(config.config, Dumper=dumper, default_flow_style=False, indent=2)
+    
+    click.echo("\n".join([
+        "=== Current Configuration ===",
+        f"Config file: {config.config_path}",
+        "",
+        dumped,
+    ]))
 
 @cli.command()
 @click.argument('key')
@@ -542,15 +678,11 @@ def config_set(ctx, key, value):
     
     config = ctx.obj['config']
     
-    # Try to parse value as appropriate type
+    # Try to parse value as a Python literal (bool, int, float, list...), keep string otherwise
+    # (literal_eval can also raise TypeError, MemoryError or RecursionError)
     try:
-        if value.lower() in ['true', 'false']:
-            value = value.lower() == 'true'
-        elif value.isdigit():
-            value = int(value)
-        elif '.' in value and value.replace('.', '').isdigit():
-            value = float(value)
-    except:
+        value = ast.literal_eval(value.capitalize() if value.lower() in ('true', 'false') else value)
+    except Exception:
         pass
     
     config.set(key, value)
@@ -576,7 +708,9 @@ def clean(ctx, folders, confirm):
     folders_to_clean = [f.strip() for f in folders.split(',')]
     
     click.echo("Folders to clean:")
-    total_files = 0
+    # One scandir pass per folder; deletion works from these lists, so no
+    # directory is modified while it is being iterated
+    files_to_delete = []
     for folder_name in folders_to_clean:
         if folder_name not in folder_map:
             click.echo(f"Unknown folder: {folder_name}")
@@ -584,12 +718,14 @@ def clean(ctx, folders, confirm):
             
         folder_path = Path(folder_map[folder_name])
         if folder_path.exists():
-            files = list(folder_path.glob('*'))
-            total_files += len(files)
-            click.echo(f"  {folder_name}: {len(files)} files in {folder_path}")
+            with os.scandir(folder_path) as it:
+                file_paths = [entry.path for entry in it if entry.is_file(follow_symlinks=False)]
+            files_to_delete.extend(file_paths)
+            click.echo(f"  {folder_name}: {len(file_paths)} files in {folder_path}")
         else:
             click.echo(f"  {folder_name}: folder doesn't exist")
     
+    total_files = len(files_to_delete)
     if total_files == 0:
         click.echo("No files to clean")
         return
@@ -599,20 +735,16 @@ def clean(ctx, folders, confirm):
             click.echo("Cancelled")
             return
     
-    deleted = 0
-    for folder_name in folders_to_clean:
-        if folder_name not in folder_map:
-            continue
-            
-        folder_path = Path(folder_map[folder_name])
-        if folder_path.exists():
-            for file_path in folder_path.glob('*'):
-                try:
-                    if file_path.is_file():
-                        file_path.unlink()
-                        deleted += 1
-                except Exception as e:
-                    click.echo(f"Error deleting {file_path}: {e}")
+    def delete_file(file_path):
+        try:
+            os.unlink(file_path)
+            return True
+        except Exception as e:
+            click.echo(f"Error deleting {file_path}: {e}")
+            return False
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        deleted = sum(executor.map(delete_file, files_to_delete))
     
     click.echo(f"Deleted {deleted} files")
 
@@ -621,39 +753,60 @@ def clean(ctx, folders, confirm):
 def configure(ctx):
     """Interactive configuration menu"""
     
+    from ..core.processor import BackgroundProcessor
+    
     config = ctx.obj['config']
     
+    last_menu = None
+    
     def show_menu():
-        click.clear()
-        click.echo("=== BG Remover Configuration ===")
-        click.echo()
-        click.echo(f"Current Settings:")
-        current_model = config.get('processing.model')
-        click.echo(f"  1. Model: {current_model}")
-        click.echo(f"  2. Device: {config.get('processing.device')}")
-        click.echo(f"  3. Quality: {config.get(f'models.{current_model}.quality', 'default')}")
-        click.echo(f"  4. Batch Size: {config.get('processing.batch_size')}")
-        click.echo(f"  5. Input Folder: {config.get('processing.input_folder')}")
-        click.echo(f"  6. Output Folder: {config.get('processing.output_folder')}")
-        click.echo(f"  7. Preserve Original: {config.get('processing.preserve_original')}")
-        click.echo(f"  8. Overwrite Existing: {config.get('processing.overwrite_existing')}")
+        """Render the menu, redrawing the screen only when the settings changed"""
+        nonlocal last_menu
+        
+        settings = config.get_many([
+            'processing.model', 'processing.device', 'processing.batch_size',
+            'processing.input_folder', 'processing.output_folder',
+            'processing.preserve_original', 'processing.overwrite_existing',
+        ])
+        current_model = settings['processing.model']
+        lines = [
+            "=== BG Remover Configuration ===",
+            "",
+            "Current Settings:",
+            f"  1. Model: {current_model}",
+            f"  2. Device: {settings['processing.device']}",
+            f"  3. Quality: {config.get(f'models.{current_model}.quality', 'default')}",
+            f"  4. Batch Size: {settings['processing.batch_size']}",
+            f"  5. Input Folder: {settings['processing.input_folder']}",
+            f"  6. Output Folder: {settings['processing.output_folder']}",
+            f"  7. Preserve Original: {settings['processing.preserve_original']}",
+            f"  8. Overwrite Existing: {settings['processing.overwrite_existing']}",
+        ]
         
         if current_model == 'transparent-background':
-            click.echo(f"  9. TB Mode: {config.get('models.transparent-background.mode', 'base')}")
+            lines.append(f"  9. TB Mode: {config.get('models.transparent-background.mode', 'base')}")
         elif current_model == 'rembg':
-            click.echo(f"  9. Rembg Model: {config.get('models.rembg.model_name', 'u2net')}")
+            lines.append(f"  9. Rembg Model: {config.get('models.rembg.model_name', 'u2net')}")
         elif current_model == 'sam':
-            click.echo(f"  9. SAM Model Type: {config.get('models.sam.model_type', 'vit_b')}")
-        
-        click.echo()
-        click.echo("  s. Save configuration")
-        click.echo("  t. Test current model")
-        click.echo("  q. Quit")
-        click.echo()
+            lines.append(f"  9. SAM Model Type: {config.get('models.sam.model_type', 'vit_b')}")
+        
+        lines.extend([
+            "",
+            "  s. Save configuration",
+            "  t. Test current model",
+            "  q. Quit",
+            "",
+        ])
+        
+        menu = "\n".join(lines)
+        if menu != last_menu:
+            click.clear()
+            click.echo(menu)
+            last_menu = menu
     
     def select_model():
         click.echo("\nAvailable models:")
-        available_models = ModelFactory.get_available_models()
+        available_models = _AVAILABLE_MODELS.choices
         for i, model in enumerate(available_models, 1):
             enabled = config.get(f'models.{model}.enabled', False)
             status = "✓" if enabled else "✗"
@@ -703,12 +856,13 @@ def configure(ctx):
         current = config.get('processing.batch_size', 1)
         click.echo(f"\nCurrent batch size: {current}")
         click.echo("Recommended values:")
+        click.echo("  0 - Auto (based on CPU count and number of files)")
         click.echo("  1 - Sequential (lowest memory)")
         click.echo("  2-4 - Moderate parallel processing")
         click.echo("  8+ - High CPU usage (requires more memory)")
         
         new_size = click.prompt("Enter batch size", type=int, default=current)
-        if new_size > 0:
+        if new_size >= 0:
             config.set('processing.batch_size', new_size)
             click.echo(f"Batch size set to: {new_size}")
         else:
@@ -792,11 +946,11 @@ def configure(ctx):
         current_model = config.get('processing.model')
         try:
             processor = BackgroundProcessor(config)
-            processor._initialize_model()
+            processor._initialize_model(in_process=True)
             memory = processor.get_memory_usage()
             click.echo(f"✓ Model '{current_model}' initialized successfully")
             click.echo(f"Memory usage: {memory['rss_mb']:.1f} MB ({memory['percent']:.1f}%)")
-            processor._cleanup_model()
+            processor._cleanup_model(release_shared=True)
             click.echo("✓ Model cleaned up successfully")
         except Exception as e:
             click.echo(f"✗ Error testing model '{current_model}': {e}")
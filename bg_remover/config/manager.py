@@ -1,12 +1,85 @@
 import os
+import copy
+import hashlib
+import pickle
 import yaml
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Prefer the LibYAML C bindings, fall back to the pure-Python implementation
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+# orjson is optional; the stdlib json module is used without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Sentinels for ConfigManager.get lookups
+_UNCACHED = object()
+_MISSING = object()
+
+@lru_cache(maxsize=256)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """Split a dot notation key once and cache the parts"""
+    return tuple(key.split('.'))
+
+# Classes YAML can produce besides builtins (timestamps)
+_SAFE_PICKLE_CLASSES = frozenset({
+    ("datetime", "date"),
+    ("datetime", "datetime"),
+    ("datetime", "timedelta"),
+    ("datetime", "timezone"),
+})
+
+# Pickled YAML configs live in the user directory, never next to the YAML file
+# (which may be the installed package's default.yaml)
+_BINARY_CACHE_DIR = Path.home() / ".bg_remover" / "cache"
+
+class _DataUnpickler(pickle.Unpickler):
+    """Unpickler restricted to plain data (no classes or callables besides dates)"""
+    
+    def find_class(self, module, name):
+        if (module, name) in _SAFE_PICKLE_CLASSES:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"Refusing to load {module}.{name} from config cache")
+
+# Parsed config files keyed by (resolved path, mtime_ns, size)
+_PARSE_CACHE: Dict[Tuple[str, int, int], Any] = {}
+
+def _invalidate_parse_cache(config_path: Path):
+    """Drop cached parses of a config file"""
+    resolved = str(config_path.resolve())
+    for key in [key for key in _PARSE_CACHE if key[0] == resolved]:
+        del _PARSE_CACHE[key]
+
+@lru_cache(maxsize=1)
+def _resolve_default_config_path() -> Path:
+    """Get default configuration file path
+    
+    Resolved once per process; call _resolve_default_config_path.cache_clear()
+    to pick up config files created afterwards.
+    """
+    # Check current directory first, then user's home directory;
+    # JSON (machine-written) is preferred over YAML in each location
+    for config_dir in (Path("."), Path.home() / ".bg_remover"):
+        for name in ("config.json", "config.yaml"):
+            candidate = config_dir / name
+            if candidate.exists():
+                return candidate
+    
+    # Use package default
+    package_dir = Path(__file__).parent
+    return package_dir / "default.yaml"
+
 class ConfigManager:
     """Manages application configuration with YAML/JSON support"""
     
@@ -18,11 +91,14 @@ class ConfigManager:
             "model": "transparent-background",
             "device": "auto",  # auto, cpu, cuda
             "batch_size": 1,
+            "cpu_workers": 0,  # CPU inference processes, 0 = in-process
             "quality": "high",
             "file_extensions": [".jpg", ".jpeg", ".png", ".bmp", ".tiff"],
             "file_stability_timeout": 2.0,
             "preserve_original": True,
-            "overwrite_existing": False
+            "overwrite_existing": False,
+            "png_compress_level": 1,
+            "include_time_in_filename": False
         },
         "models": {
             "transparent-background": {
@@ -58,26 +134,11 @@ class ConfigManager:
         Args:
             config_path: Path to configuration file
         """
-        self.config_path = Path(config_path) if config_path else self._get_default_config_path()
-        self._config = self.DEFAULT_CONFIG.copy()
+        self.config_path = Path(config_path) if config_path else _resolve_default_config_path()
+        self._config = copy.deepcopy(self.DEFAULT_CONFIG)
+        self._get_cache: Dict[str, Any] = {}
         self._load_config()
     
-    def _get_default_config_path(self) -> Path:
-        """Get default configuration file path"""
-        # Check for config in current directory first
-        local_config = Path("config.yaml")
-        if local_config.exists():
-            return local_config
-        
-        # Check user's home directory
-        home_config = Path.home() / ".bg_remover" / "config.yaml"
-        if home_config.exists():
-            return home_config
-        
-        # Use package default
-        package_dir = Path(__file__).parent
-        return package_dir / "default.yaml"
-    
     def _load_config(self):
         """Load configuration from file"""
         if not self.config_path.exists():
@@ -86,39 +147,100 @@ class ConfigManager:
             return
         
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
+            # Reuse the parsed file while its path, mtime and size are unchanged
+            stat = self.config_path.stat()
+            cache_key = (str(self.config_path.resolve()), stat.st_mtime_ns, stat.st_size)
+            
+            if cache_key in _PARSE_CACHE:
+                user_config = copy.deepcopy(_PARSE_CACHE[cache_key])
+            else:
                 if self.config_path.suffix.lower() == '.json':
-                    user_config = json.load(f)
+                    raw = self.config_path.read_bytes()
+                    user_config = orjson.loads(raw) if orjson is not None else json.loads(raw)
                 else:
-                    user_config = yaml.safe_load(f)
+                    user_config = self._load_yaml_with_binary_cache()
+                _PARSE_CACHE[cache_key] = copy.deepcopy(user_config)
             
-            # Deep merge with defaults
-            self._config = self._deep_merge(self.DEFAULT_CONFIG, user_config)
+            # Apply user overrides onto the defaults copied in __init__
+            self._apply_overrides(self._config, user_config)
+            self._get_cache.clear()
             logger.info(f"Configuration loaded from {self.config_path}")
             
         except Exception as e:
             logger.error(f"Error loading config from {self.config_path}: {e}")
             logger.info("Using default configuration")
     
+    def _load_yaml_with_binary_cache(self) -> Any:
+        """Load YAML config, preferring a pickled copy in the user cache directory
+        
+        The pickle holds a hash of the YAML bytes it was built from and is
+        ignored (and rebuilt) whenever the YAML content changes.
+        
+        Returns:
+            Parsed configuration
+        """
+        raw = self.config_path.read_bytes()
+        digest = hashlib.blake2b(raw, digest_size=8).hexdigest()
+        path_digest = hashlib.blake2b(str(self.config_path.resolve()).encode(), digest_size=8).hexdigest()
+        cache_path = _BINARY_CACHE_DIR / f"{self.config_path.stem}-{path_digest}.pkl"
+        
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_digest, cached_config = _DataUnpickler(f).load()
+            if cached_digest == digest:
+                return cached_config
+        except Exception:
+            pass
+        
+        user_config = yaml.load(raw, Loader=_Loader)
+        
+        # Cache is best effort (home may be read-only)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(cache_path.name + f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((digest, user_config), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.debug(f"Could not write config cache {cache_path}: {e}")
+        
+        return user_config
+    
     def _save_default_config(self):
         """Save default configuration to file"""
         try:
-            self.config_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(self.DEFAULT_CONFIG, f, default_flow_style=False, indent=2)
+            self._write_config(self.DEFAULT_CONFIG)
             logger.info(f"Default configuration saved to {self.config_path}")
         except Exception as e:
             logger.error(f"Error saving default config: {e}")
     
-    def _deep_merge(self, base: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
-        """Deep merge two dictionaries"""
-        result = base.copy()
-        for key, value in update.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._deep_merge(result[key], value)
+    def _write_config(self, data: Dict[str, Any]):
+        """Write configuration to the config file, as JSON or YAML by suffix
+        
+        Args:
+            data: Configuration dictionary to write
+        """
+        self.config_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.config_path.suffix.lower() == '.json':
+            if orjson is not None:
+                self.config_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
             else:
-                result[key] = value
-        return result
+                with open(self.config_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+        else:
+            with open(self.config_path, 'w', encoding='utf-8') as f:
+                yaml.dump(data, f, Dumper=_Dumper, default_flow_style=False, indent=2)
+    
+    def _apply_overrides(self, target: Dict[str, Any], overrides: Dict[str, Any]):
+        """Deep merge overrides into target in place, walking only the override keys"""
+        stack = [(target, overrides)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                if key in target and isinstance(target[key], dict) and isinstance(value, dict):
+                    stack.append((target[key], value))
+                else:
+                    target[key] = value
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by dot notation key
@@ -130,16 +252,30 @@ class ConfigManager:
         Returns:
             Configuration value
         """
-        keys = key.split('.')
-        value = self._config
+        value = self._get_cache.get(key, _UNCACHED)
+        if value is _UNCACHED:
+            value = self._config
+            for k in _split_key(key):
+                if isinstance(value, dict) and k in value:
+                    value = value[k]
+                else:
+                    value = _MISSING
+                    break
+            self._get_cache[key] = value
         
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
+        return default if value is _MISSING else value
+    
+    def get_many(self, keys: List[str], default: Any = None) -> Dict[str, Any]:
+        """Get several configuration values by dot notation key
         
-        return value
+        Args:
+            keys: Configuration keys (e.g., ['processing.model', 'processing.device'])
+            default: Default value for keys not found
+            
+        Returns:
+            Dictionary mapping each key to its value
+        """
+        return {key: self.get(key, default) for key in keys}
     
     def set(self, key: str, value: Any):
         """Set configuration value by dot notation key
@@ -148,7 +284,8 @@ class ConfigManager:
             key: Configuration key (e.g., 'processing.model')
             value: Value to set
         """
-        keys = key.split('.')
+        self._get_cache.clear()
+        keys = _split_key(key)
         target = self._config
         
         for k in keys[:-1]:
@@ -160,13 +297,9 @@ class ConfigManager:
     
     def save(self):
         """Save current configuration to file"""
+        _invalidate_parse_cache(self.config_path)
         try:
-            self.config_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                if self.config_path.suffix.lower() == '.json':
-                    json.dump(self._config, f, indent=2, ensure_ascii=False)
-                else:
-                    yaml.dump(self._config, f, default_flow_style=False, indent=2)
+            self._write_config(self._config)
             logger.info(f"Configuration saved to {self.config_path}")
         except Exception as e:
             logger.error(f"Error saving configuration: {e}")
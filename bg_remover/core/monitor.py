@@ -1,3 +1,4 @@
+import threading
 import time
 from pathlib import Path
 from typing import Callable, Optional, Set
@@ -9,6 +10,10 @@ from ..config.manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+# A pending batch is flushed at the latest this many debounce periods after
+# its first file arrived, even if events keep coming
+DEBOUNCE_MAX_WAIT_FACTOR = 4
+
 class FileEventHandler(FileSystemEventHandler):
     """Handle file system events for folder monitoring"""
     
@@ -16,7 +21,7 @@ class FileEventHandler(FileSystemEventHandler):
         """Initialize event handler
         
         Args:
-            processor_callback: Callback function for processing files
+            processor_callback: Callback function receiving a list of files to process
             config: Configuration manager
         """
         super().__init__()
@@ -25,15 +30,24 @@ class FileEventHandler(FileSystemEventHandler):
         self.debounce_seconds = config.get("monitoring.debounce_seconds", 1.0)
         self.pending_files: Set[Path] = set()
         self.last_event_time = {}
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._batch_started: Optional[float] = None  # perf_counter of the batch's first file
+        self._ext_source = None
+        self._ext_set = frozenset()
         
     def _is_supported_file(self, file_path: Path) -> bool:
         """Check if file is supported"""
         extensions = self.config.get("processing.file_extensions", [])
-        return file_path.suffix.lower() in [ext.lower() for ext in extensions]
+        if extensions is not self._ext_source:
+            self._ext_set = frozenset(ext.lower() for ext in extensions)
+            self._ext_source = extensions
+        suffix = file_path.suffix
+        return suffix in self._ext_set or suffix.lower() in self._ext_set
     
     def _should_process_event(self, file_path: Path) -> bool:
         """Check if event should trigger processing"""
-        current_time = time.time()
+        current_time = time.perf_counter()
         
         # Check debounce
         if file_path in self.last_event_time:
@@ -43,6 +57,60 @@ class FileEventHandler(FileSystemEventHandler):
         self.last_event_time[file_path] = current_time
         return True
     
+    def _queue_file(self, file_path: Path):
+        """Add file to the pending batch and reschedule its flush
+        
+        The batch is flushed after debounce_seconds without new files, after
+        DEBOUNCE_MAX_WAIT_FACTOR debounce periods since its first file, or
+        as soon as it holds processing.batch_size files (0 = no size limit),
+        whichever comes first.
+        """
+        batch_size = self.config.get("processing.batch_size", 1)
+        
+        with self._pending_lock:
+            self.pending_files.add(file_path)
+            now = time.perf_counter()
+            if self._batch_started is None:
+                self._batch_started = now
+            
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            
+            full = batch_size > 0 and len(self.pending_files) >= batch_size
+            if not full:
+                deadline = self._batch_started + self.debounce_seconds * DEBOUNCE_MAX_WAIT_FACTOR
+                delay = max(0.0, min(self.debounce_seconds, deadline - now))
+                self._flush_timer = threading.Timer(delay, self._flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        
+        if full:
+            self._flush()
+    
+    def _flush(self):
+        """Hand all pending files to the processor callback in one call"""
+        with self._pending_lock:
+            files = sorted(self.pending_files)
+            self.pending_files.clear()
+            self._batch_started = None
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        
+        if files:
+            logger.debug(f"Flushing {len(files)} pending files")
+            self.processor_callback(files)
+    
+    def cancel_pending(self):
+        """Stop the debounce timer and drop pending files"""
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self.pending_files.clear()
+            self._batch_started = None
+    
     def on_created(self, event):
         """Handle file creation events"""
         if event.is_directory:
@@ -57,7 +125,7 @@ class FileEventHandler(FileSystemEventHandler):
             return
         
         logger.debug(f"File created: {file_path}")
-        self.processor_callback(file_path)
+        self._queue_file(file_path)
     
     def on_moved(self, event):
         """Handle file move events (e.g., from temp to final location)"""
@@ -73,7 +141,7 @@ class FileEventHandler(FileSystemEventHandler):
             return
         
         logger.debug(f"File moved: {dest_path}")
-        self.processor_callback(dest_path)
+        self._queue_file(dest_path)
 
 class FolderMonitor:
     """Monitor folder for new files and trigger processing"""
@@ -83,11 +151,14 @@ class FolderMonitor:
         
         Args:
             config_manager: Configuration manager
-            processor_callback: Callback function for processing files
+            processor_callback: Callback function receiving a list of files to process;
+                events arriving within monitoring.debounce_seconds are delivered together
+                (see FileEventHandler._queue_file for the flush rules)
         """
         self.config = config_manager
         self.processor_callback = processor_callback
         self.observer = None
+        self.event_handler = None
         self.is_monitoring = False
         
     def start_monitoring(self, folder_path: Optional[str] = None):
@@ -110,12 +181,12 @@ class FolderMonitor:
             raise FileNotFoundError(f"Monitor folder not found: {watch_path}")
         
         # Create event handler
-        event_handler = FileEventHandler(self.processor_callback, self.config)
+        self.event_handler = FileEventHandler(self.processor_callback, self.config)
         
         # Setup observer
         self.observer = Observer()
         recursive = self.config.get("monitoring.recursive", False)
-        self.observer.schedule(event_handler, str(watch_path), recursive=recursive)
+        self.observer.schedule(self.event_handler, str(watch_path), recursive=recursive)
         
         # Start monitoring
         self.observer.start()
@@ -131,6 +202,8 @@ class FolderMonitor:
         self.observer.stop()
         self.observer.join()
         self.observer = None
+        self.event_handler.cancel_pending()
+        self.event_handler = None
         self.is_monitoring = False
         
         logger.info("Stopped folder monitoring")
@@ -1,19 +1,63 @@
+import math
+import multiprocessing
 import os
 import shutil
+import sys
+import threading
 import time
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Dict, Any, Callable, Tuple, Iterator
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import logging
+import numpy as np
 from PIL import Image
 import psutil
 
+# Optional faster PNG encoder
+try:
+    import imagecodecs
+except ImportError:
+    imagecodecs = None
+
 from ..models.factory import ModelFactory
 from ..config.manager import ConfigManager
+from ..utils.device_utils import get_optimal_batch_size
+from ..utils.file_utils import scan_images
 from .statistics import ProcessingStats
 
 logger = logging.getLogger(__name__)
 
+# Seconds between samples when waiting for a file to stop changing
+FILE_STABILITY_POLL_INTERVAL = 0.05
+
+# Images decoded ahead of the model / results waiting to be encoded
+PIPELINE_DEPTH = 4
+
+# Page size and physical memory for reading /proc/self/statm (Linux only)
+if sys.platform.startswith("linux"):
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+    _TOTAL_MEMORY = _PAGE_SIZE * os.sysconf("SC_PHYS_PAGES")
+else:
+    _PAGE_SIZE = _TOTAL_MEMORY = 0
+
+# Model instance owned by a CPU inference worker process
+_worker_model = None
+
+def _worker_init(model_class: type, device: str, options: Dict[str, Any]):
+    """Load the model once in a CPU inference worker process
+    
+    The class is passed rather than its registry name because spawned
+    workers start with a fresh ModelFactory registry.
+    """
+    global _worker_model
+    _worker_model = model_class(device=device, **options)
+    _worker_model.initialize()
+
+def _worker_process_image(image: Image.Image) -> Image.Image:
+    """Remove the background of one image with the worker's model"""
+    return _worker_model.process_image(image)
+
 class BackgroundProcessor:
     """Main background removal processor"""
     
@@ -28,6 +72,16 @@ class BackgroundProcessor:
         self.model = None
         self.is_running = False
         self._shutdown_requested = False
+        self._ext_source = None
+        self._ext_set = frozenset()
+        self._output_folder: Optional[Path] = None
+        self._include_time = False
+        self._output_suffix: Optional[str] = None
+        self._worker_pool: Optional[ProcessPoolExecutor] = None
+        self._model_options: Dict[str, Any] = {}
+        
+        # zlib level for output PNGs (1 = fastest, 9 = smallest)
+        self._png_compress_level = self.config.get("processing.png_compress_level", 1)
         
         # Setup directories
         self._setup_directories()
@@ -45,37 +99,41 @@ class BackgroundProcessor:
         for dir_path in dirs:
             Path(dir_path).mkdir(parents=True, exist_ok=True)
             logger.debug(f"Directory ensured: {dir_path}")
+        
+        # Originals can be moved with a single rename when both folders share a filesystem
+        self._same_fs = False
+        if self.config.get("processing.preserve_original"):
+            try:
+                self._same_fs = (os.stat(self.config.get("processing.input_folder")).st_dev ==
+                                 os.stat(self.config.get("processing.processed_folder")).st_dev)
+            except OSError:
+                pass
             
     def _generate_output_filename(self, input_path: Path, processing_time: float = None) -> Path:
-        """Generate output filename with model, quality and timing information"""
-        output_folder = Path(self.config.get("processing.output_folder"))
-        model_name = self.config.get("processing.model")
+        """Generate output filename with model, quality and (optionally) timing information"""
+        if self._output_suffix is not None:
+            # Fast path: everything but the stem was cached at model initialization
+            if processing_time is not None and self._include_time:
+                return self._output_folder / f"{input_path.stem}{self._output_suffix[:-4]}_{processing_time:.1f}s.png"
+            return self._output_folder / f"{input_path.stem}{self._output_suffix}"
         
-        # Get model-specific settings
-        model_config = self.config.get(f"models.{model_name}", {})
-        quality = model_config.get("quality", "default")
-        device = self.model.device if self.model else "unknown"
-        
-        # For rembg, include model variant
-        if model_name == "rembg":
-            model_variant = model_config.get("model_name", "u2net")
-            model_info = f"{model_name}_{model_variant}"
-        else:
-            model_info = model_name
+        output_folder = Path(self.config.get("processing.output_folder"))
         
-        # Create detailed filename with timing
-        base_name = input_path.stem
+        parts = self._get_output_name_parts()
         
-        if processing_time is not None:
-            time_str = f"{processing_time:.1f}s"
-            output_name = f"{base_name}_{model_info}_{quality}_{device}_{time_str}.png"
-        else:
-            output_name = f"{base_name}_{model_info}_{quality}_{device}.png"
+        if processing_time is not None and self.config.get("processing.include_time_in_filename", False):
+            model_info, quality, device = parts
+            return output_folder / f"{input_path.stem}_{model_info}_{quality}_{device}_{processing_time:.1f}s.png"
         
-        return output_folder / output_name
+        return output_folder / f"{input_path.stem}{self._format_output_suffix(parts)}"
     
-    def _initialize_model(self):
-        """Initialize the background removal model"""
+    def _initialize_model(self, in_process: bool = False):
+        """Initialize the background removal model
+        
+        Args:
+            in_process: Always load the weights in this process, even if CPU
+                workers are configured (used to test that a model loads)
+        """
         if self.model is not None:
             return
         
@@ -88,7 +146,7 @@ class BackgroundProcessor:
         try:
             # Create model with configuration
             device = model_config.get("device", self.config.get("processing.device", "auto"))
-            options = model_config.get("options", {})
+            options = dict(model_config.get("options", {}))
             
             # Add quality setting if available
             if "quality" in model_config:
@@ -99,7 +157,17 @@ class BackgroundProcessor:
                 options["mode"] = model_config["mode"]
             
             self.model = ModelFactory.create_model(model_name, device=device, **options)
-            self.model.initialize()
+            # Keep the full constructor options, the model consumes some of them
+            self._model_options = options
+            
+            # Opt-in: CPU inference in worker processes, each loading its own
+            # copy of the model; CUDA contexts don't survive fork, so GPU models
+            # stay in-process
+            if not in_process and self.model.device == "cpu" and self.config.get("processing.cpu_workers", 0) > 0:
+                self._start_worker_pool()
+            else:
+                self.model.initialize()
+            self._cache_output_name_parts()
             
             logger.info(f"Model initialized: {model_name} on {self.model.device}")
             
@@ -107,16 +175,112 @@ class BackgroundProcessor:
             logger.error(f"Failed to initialize model '{model_name}': {e}")
             raise
     
-    def _cleanup_model(self):
-        """Clean up model resources"""
+    def set_quality(self, quality: str):
+        """Set quality for the current model without reloading its weights
+        
+        Args:
+            quality: Quality setting ('low', 'medium', 'high')
+        """
+        model_name = self.config.get("processing.model")
+        self.config.set(f"models.{model_name}.quality", quality)
+        
+        if self.model is not None:
+            self.model.options["quality"] = quality
+            self._model_options["quality"] = quality
+            if hasattr(self.model, "quality"):
+                self.model.quality = quality
+            self._cache_output_name_parts()
+            
+            # Workers hold their own copy of the options
+            if self._worker_pool is not None:
+                self._stop_worker_pool()
+                self._start_worker_pool()
+    
+    def _start_worker_pool(self):
+        """Start CPU inference worker processes for the current model"""
+        workers = self.config.get("processing.cpu_workers", 0)
+        # Spawn instead of fork: workers start lazily on the first map(), when
+        # the pipeline's decode/encode threads may hold locks a forked child
+        # would inherit
+        self._worker_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_worker_init,
+            initargs=(type(self.model), self.model.device, dict(self._model_options))
+        )
+        logger.debug(f"Started {workers} CPU inference workers")
+    
+    def _stop_worker_pool(self):
+        """Shut down CPU inference worker processes"""
+        if self._worker_pool is not None:
+            # Work is only submitted through map(), which the pipeline drains
+            # before returning, so nothing is left queued here
+            self._worker_pool.shutdown(wait=True)
+            self._worker_pool = None
+    
+    def _get_output_name_parts(self) -> Tuple[str, str, str]:
+        """Look up the model/quality/device parts of output filenames"""
+        model_name = self.config.get("processing.model")
+        model_config = self.config.get(f"models.{model_name}", {})
+        
+        # For rembg, include model variant
+        if model_name == "rembg":
+            model_info = f"{model_name}_{model_config.get('model_name', 'u2net')}"
+        else:
+            model_info = model_name
+        
+        device = self.model.device if self.model else "unknown"
+        return model_info, model_config.get("quality", "default"), device
+    
+    @staticmethod
+    def _format_output_suffix(parts: Tuple[str, str, str]) -> str:
+        """Build the untimed output filename suffix from its parts"""
+        model_info, quality, device = parts
+        return f"_{model_info}_{quality}_{device}.png"
+    
+    def _cache_output_name_parts(self):
+        """Cache the output folder and filename parts for the loaded model"""
+        self._output_folder = Path(self.config.get("processing.output_folder"))
+        self._include_time = self.config.get("processing.include_time_in_filename", False)
+        self._output_suffix = self._format_output_suffix(self._get_output_name_parts())
+    
+    def _scan_existing_outputs(self) -> frozenset:
+        """List file names in the output folder with a single directory read"""
+        try:
+            with os.scandir(self.config.get("processing.output_folder")) as entries:
+                return frozenset(entry.name for entry in entries)
+        except FileNotFoundError:
+            return frozenset()
+    
+    def _cleanup_model(self, release_shared: bool = False):
+        """Clean up model resources
+        
+        Args:
+            release_shared: Also free resources the model class shares between
+                instances (e.g. cached rembg sessions)
+        """
+        self._stop_worker_pool()
         if self.model is not None:
             try:
                 self.model.cleanup()
+                if release_shared:
+                    type(self.model).release_shared_resources()
                 self.model = None
+                self._output_folder = None
+                self._output_suffix = None
                 logger.debug("Model cleaned up")
             except Exception as e:
                 logger.error(f"Error cleaning up model: {e}")
     
+    @property
+    def _extension_set(self) -> frozenset:
+        """Lower-cased supported extensions, rebuilt only when the configured list changes"""
+        extensions = self.config.get("processing.file_extensions", [])
+        if extensions is not self._ext_source:
+            self._ext_set = frozenset(ext.lower() for ext in extensions)
+            self._ext_source = extensions
+        return self._ext_set
+    
     def _is_supported_file(self, file_path: Path) -> bool:
         """Check if file is supported for processing
         
@@ -126,8 +290,10 @@ class BackgroundProcessor:
         Returns:
             True if file is supported
         """
-        extensions = self.config.get("processing.file_extensions", [])
-        return file_path.suffix.lower() in [ext.lower() for ext in extensions]
+        suffix = file_path.suffix
+        extensions = self._extension_set
+        # Lower-case suffixes (the common case) match without allocating a copy
+        return suffix in extensions or suffix.lower() in extensions
     
     def _is_file_stable(self, file_path: Path) -> bool:
         """Check if file is stable (not being written to)
@@ -140,24 +306,46 @@ class BackgroundProcessor:
         """
         try:
             timeout = self.config.get("processing.file_stability_timeout", 2.0)
-            initial_size = file_path.stat().st_size
-            time.sleep(timeout)
             
-            if not file_path.exists():
-                return False
+            # Poll size/mtime and return as soon as two consecutive samples match,
+            # instead of always waiting for the full timeout
+            interval = min(FILE_STABILITY_POLL_INTERVAL, timeout) if timeout > 0 else 0
+            samples = max(1, int(timeout / interval)) if interval else 1
             
-            current_size = file_path.stat().st_size
-            return initial_size == current_size
+            stat = file_path.stat()
+            previous = (stat.st_size, stat.st_mtime_ns)
+            matches = 0
+            
+            for _ in range(samples):
+                time.sleep(interval)
+                
+                if not file_path.exists():
+                    return False
+                
+                stat = file_path.stat()
+                current = (stat.st_size, stat.st_mtime_ns)
+                if current == previous:
+                    matches += 1
+                    if matches >= 2:
+                        return True
+                else:
+                    matches = 0
+                    previous = current
+            
+            # Timeout reached: stable only if nothing changed during the last interval
+            return matches > 0
             
         except Exception as e:
             logger.warning(f"Error checking file stability for {file_path}: {e}")
             return False
     
-    def _should_process_file(self, input_path: Path) -> bool:
+    def _should_process_file(self, input_path: Path, existing_outputs: Optional[frozenset] = None) -> bool:
         """Check if file should be processed with enhanced output checking
         
         Args:
             input_path: Input file path
+            existing_outputs: Output folder listing from _scan_existing_outputs
+                (checks the output path on disk if None)
             
         Returns:
             True if file should be processed
@@ -168,96 +356,243 @@ class BackgroundProcessor:
         if not input_path.exists():
             return False
         
+        if self.config.get("processing.overwrite_existing", False):
+            return True
+        
         # Check if output already exists with current model/quality settings (without timing)
-        output_path = self._generate_output_filename(input_path)
+        if existing_outputs is not None and self._output_suffix is not None:
+            output_name = input_path.stem + self._output_suffix
+            exists = output_name in existing_outputs
+        else:
+            output_name = self._generate_output_filename(input_path)
+            exists = output_name.exists()
         
-        if output_path.exists() and not self.config.get("processing.overwrite_existing", False):
-            logger.debug(f"Output already exists, skipping: {output_path}")
+        if exists:
+            logger.debug(f"Output already exists, skipping: {output_name}")
             return False
         
         return True
     
-    def _process_single_file(self, input_path: Path, progress_callback: Optional[Callable] = None) -> bool:
-        """Process a single file with enhanced naming
+    def _load_image(self, input_path: Path) -> Optional[Tuple[Image.Image, int, int]]:
+        """Wait for a file to be stable and decode it
         
         Args:
             input_path: Input file path
-            progress_callback: Optional progress callback function
             
         Returns:
-            True if processing was successful
+            Tuple of (decoded image, original file size, perf_counter_ns start time), or None
+            if the file vanished or never became stable
         """
-        try:
-            if not self._should_process_file(input_path):
-                return False
-            
-            # Check if file still exists before processing (important for monitoring)
-            if not input_path.exists():
-                logger.warning(f"File no longer exists, skipping: {input_path}")
-                return False
+        # Check if file still exists before processing (important for monitoring)
+        if not input_path.exists():
+            logger.warning(f"File no longer exists, skipping: {input_path}")
+            return None
+        
+        logger.info(f"Processing: {input_path}")
+        start_time = time.perf_counter_ns()
+        
+        # Store original file size for stats
+        original_file_size = input_path.stat().st_size
+        
+        # Wait for file to be stable
+        if not self._is_file_stable(input_path):
+            logger.warning(f"File not stable, skipping: {input_path}")
+            return None
+        
+        # Decode fully so the file handle is released before inference
+        with Image.open(input_path) as image:
+            image.load()
+        
+        return image, original_file_size, start_time
+    
+    def _run_pipeline(self, chunks: List[List[Path]], decode_workers: int,
+                      progress_callback: Optional[Callable] = None) -> Tuple[int, int]:
+        """Run chunks of files through a decode -> infer -> encode pipeline
+        
+        Decoding of upcoming chunks and saving of finished results run on
+        thread pools while the calling thread runs the model, one
+        BaseModel.process_batch call per chunk.
+        
+        Args:
+            chunks: Files to process, grouped into model batches
+            decode_workers: Number of decode threads
+            progress_callback: Optional progress callback function
             
-            logger.info(f"Processing: {input_path}")
-            start_time = time.time()
+        Returns:
+            Tuple of (processed count, failed count)
+        """
+        processed = 0
+        failed = 0
+        
+        # Keep about PIPELINE_DEPTH decoded images ahead of the model, and cap
+        # results waiting to be encoded the same way
+        prefetch_chunks = math.ceil(PIPELINE_DEPTH / len(chunks[0])) if chunks else 1
+        max_writers = min(8, os.cpu_count() or 1)
+        pending_saves = threading.BoundedSemaphore(max(PIPELINE_DEPTH, max_writers * 2))
+        
+        with ThreadPoolExecutor(max_workers=decode_workers, thread_name_prefix="decode") as decoder, \
+                ThreadPoolExecutor(max_workers=max_writers, thread_name_prefix="encode") as writer:
             
-            # Store original file size for stats
-            original_file_size = input_path.stat().st_size
+            def submit_loads(chunk):
+                return [(path, decoder.submit(self._load_image, path)) for path in chunk]
             
-            # Wait for file to be stable
-            if not self._is_file_stable(input_path):
-                logger.warning(f"File not stable, skipping: {input_path}")
-                return False
+            in_flight = deque(submit_loads(chunk) for chunk in chunks[:prefetch_chunks])
+            next_chunk = len(in_flight)
+            save_futures = []
             
-            # Load image
-            with Image.open(input_path) as image:
-                # Process image
-                result = self.model.process_image(image)
+            while in_flight:
+                loads = in_flight.popleft()
                 
-                # Calculate processing time
-                processing_time = time.time() - start_time
+                if self._shutdown_requested:
+                    for pending in [loads, *in_flight]:
+                        for _, future in pending:
+                            future.cancel()
+                    break
                 
-                # Generate output path with detailed naming including timing
-                output_path = self._generate_output_filename(input_path, processing_time)
+                if next_chunk < len(chunks):
+                    in_flight.append(submit_loads(chunks[next_chunk]))
+                    next_chunk += 1
                 
-                # Save result
-                result.save(output_path, "PNG")
-                
-                # Handle original file ONLY if it still exists
-                if self.config.get("processing.preserve_original") and input_path.exists():
-                    processed_folder = Path(self.config.get("processing.processed_folder"))
-                    processed_path = processed_folder / input_path.name
-                    shutil.move(str(input_path), str(processed_path))
-                    logger.debug(f"Moved original to: {processed_path}")
-                
-                # Update statistics
-                self.stats.add_success(processing_time, original_file_size)
-                
-                logger.info(f"Completed: {input_path} -> {output_path} ({processing_time:.2f}s)")
+                # Stage 1: collect decoded images
+                loaded = []
+                for input_path, future in loads:
+                    try:
+                        item = future.result()
+                    except Exception as e:
+                        self._record_failure(input_path, 0, progress_callback, e)
+                        failed += 1
+                        continue
+                    
+                    if item is None:
+                        failed += 1
+                    else:
+                        loaded.append((input_path, *item))
                 
-                if progress_callback:
-                    progress_callback(input_path, output_path, True, processing_time)
+                if not loaded:
+                    continue
                 
-                return True
+                # Stage 2: inference
+                results = self._infer([image for _, image, _, _ in loaded])
                 
+                # Stage 3: encode and save
+                end_time = time.perf_counter_ns()
+                for (input_path, _, original_file_size, start_time), result in zip(loaded, results):
+                    if isinstance(result, Exception):
+                        self._record_failure(input_path, original_file_size, progress_callback, result)
+                        failed += 1
+                        continue
+                    
+                    pending_saves.acquire()
+                    future = writer.submit(self._save_result, input_path, result, (end_time - start_time) / 1e9,
+                                           original_file_size, progress_callback)
+                    future.add_done_callback(lambda _: pending_saves.release())
+                    save_futures.append(future)
+            
+            for future in save_futures:
+                if future.result():
+                    processed += 1
+                else:
+                    failed += 1
+        
+        return processed, failed
+    
+    def _infer(self, images: List[Image.Image]) -> List[Any]:
+        """Remove the background of a batch of images
+        
+        If the batched call fails, the images are retried one at a time so a
+        single bad image only fails its own file.
+        
+        Args:
+            images: Decoded input images
+            
+        Returns:
+            Processed image or the raised exception for each input, in input order
+        """
+        try:
+            if self._worker_pool is not None:
+                return list(self._worker_pool.map(_worker_process_image, images))
+            return self.model.process_batch(images)
         except Exception as e:
-            # Use stored file size if available
-            file_size = 0
+            if len(images) == 1:
+                return [e]
+            logger.debug(f"Batch of {len(images)} failed ({e}), retrying images one by one")
+        
+        results = []
+        for image in images:
             try:
-                if input_path.exists():
-                    file_size = input_path.stat().st_size
+                if self._worker_pool is not None:
+                    results.append(self._worker_pool.submit(_worker_process_image, image).result())
                 else:
-                    # Try to get size from locals if we stored it earlier
-                    file_size = locals().get('original_file_size', 0)
-            except:
-                pass
-                
-            logger.error(f"Error processing {input_path}: {e}")
-            self.stats.add_failure(file_size)
+                    results.append(self.model.process_image(image))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def _save_result(self, input_path: Path, result: Image.Image, processing_time: float,
+                     original_file_size: int, progress_callback: Optional[Callable] = None) -> bool:
+        """Save a processed image and move the original
+        
+        Args:
+            input_path: Input file path
+            result: Processed image
+            processing_time: Time taken to process
+            original_file_size: Size of the input file in bytes
+            progress_callback: Optional progress callback function
+            
+        Returns:
+            True if the result was saved
+        """
+        try:
+            # Generate output path with detailed naming including timing
+            output_path = self._generate_output_filename(input_path, processing_time)
+            
+            # Save result
+            if imagecodecs is not None:
+                imagecodecs.imwrite(output_path, np.asarray(result), codec="png", level=self._png_compress_level)
+            else:
+                result.save(output_path, "PNG", compress_level=self._png_compress_level, optimize=False)
+            
+            # Handle original file ONLY if it still exists
+            if self.config.get("processing.preserve_original") and input_path.exists():
+                processed_folder = Path(self.config.get("processing.processed_folder"))
+                processed_path = processed_folder / input_path.name
+                if self._same_fs:
+                    os.replace(input_path, processed_path)
+                else:
+                    shutil.move(str(input_path), str(processed_path))
+                logger.debug(f"Moved original to: {processed_path}")
+            
+            # Update statistics
+            self.stats.add_success(processing_time, original_file_size)
+            
+            logger.info(f"Completed: {input_path} -> {output_path} ({processing_time:.2f}s)")
             
             if progress_callback:
-                progress_callback(input_path, None, False, 0)
+                progress_callback(input_path, output_path, True, processing_time)
+            
+            return True
             
+        except Exception as e:
+            self._record_failure(input_path, original_file_size, progress_callback, e)
             return False
     
+    def _record_failure(self, input_path: Path, original_file_size: int,
+                        progress_callback: Optional[Callable], error: Exception):
+        """Record a failed file in statistics and notify the callback"""
+        # Use stored file size if the file is gone
+        file_size = original_file_size
+        try:
+            if input_path.exists():
+                file_size = input_path.stat().st_size
+        except:
+            pass
+            
+        logger.error(f"Error processing {input_path}: {error}")
+        self.stats.add_failure(file_size)
+        
+        if progress_callback:
+            progress_callback(input_path, None, False, 0)
+    
     def process_batch(self, input_paths: List[Path], progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
         """Process multiple files
         
@@ -271,57 +606,24 @@ class BackgroundProcessor:
         if not input_paths:
             return {"processed": 0, "failed": 0, "skipped": 0}
         
-        # Initialize model
+        # Initialize model on first use; it stays loaded across batches until shutdown()
         self._initialize_model()
         
         try:
             self.is_running = True
             batch_size = self.config.get("processing.batch_size", 1)
+            if not batch_size:
+                # 0/unset means auto-size from CPU count and queue depth
+                batch_size = get_optimal_batch_size(len(input_paths))
+                logger.debug(f"Auto batch size: {batch_size}")
             
-            processed = 0
-            failed = 0
-            skipped = 0
+            existing_outputs = self._scan_existing_outputs()
+            candidates = [path for path in input_paths if self._should_process_file(path, existing_outputs)]
+            skipped = len(input_paths) - len(candidates)
             
-            if batch_size == 1:
-                # Sequential processing
-                for input_path in input_paths:
-                    if self._shutdown_requested:
-                        break
-                    
-                    if self._should_process_file(input_path):
-                        success = self._process_single_file(input_path, progress_callback)
-                        if success:
-                            processed += 1
-                        else:
-                            failed += 1
-                    else:
-                        skipped += 1
-            else:
-                # Parallel processing
-                with ThreadPoolExecutor(max_workers=batch_size) as executor:
-                    future_to_path = {
-                        executor.submit(self._process_single_file, path, progress_callback): path
-                        for path in input_paths if self._should_process_file(path)
-                    }
-                    
-                    skipped = len(input_paths) - len(future_to_path)
-                    
-                    for future in as_completed(future_to_path):
-                        if self._shutdown_requested:
-                            # Cancel remaining futures
-                            for f in future_to_path:
-                                f.cancel()
-                            break
-                        
-                        try:
-                            success = future.result()
-                            if success:
-                                processed += 1
-                            else:
-                                failed += 1
-                        except Exception as e:
-                            logger.error(f"Batch processing error: {e}")
-                            failed += 1
+            # Chunks of batch_size files share one model call (batch_size 1 = one image per call)
+            chunks = [candidates[start:start + batch_size] for start in range(0, len(candidates), batch_size)]
+            processed, failed = self._run_pipeline(chunks, max(2, batch_size), progress_callback)
             
             return {
                 "processed": processed,
@@ -333,14 +635,17 @@ class BackgroundProcessor:
             
         finally:
             self.is_running = False
-            self._cleanup_model()
+            if self._shutdown_requested:
+                self._cleanup_model()
     
-    def process_folder(self, input_folder: Optional[str] = None, progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    def process_folder(self, input_folder: Optional[str] = None, progress_callback: Optional[Callable] = None,
+                       files: Optional[List[Path]] = None) -> Dict[str, Any]:
         """Process all supported files in a folder
         
         Args:
             input_folder: Input folder path (uses config default if None)
             progress_callback: Optional progress callback function
+            files: Pre-scanned list of files in the folder (skips the directory scan if given)
             
         Returns:
             Processing results summary
@@ -351,21 +656,36 @@ class BackgroundProcessor:
             raise FileNotFoundError(f"Input folder not found: {folder_path}")
         
         # Find all supported files
-        extensions = self.config.get("processing.file_extensions", [])
-        files = []
-        
-        for ext in extensions:
-            files.extend(folder_path.glob(f"*{ext}"))
-            files.extend(folder_path.glob(f"*{ext.upper()}"))
+        if files is None:
+            files = list(self.iter_folder_files(folder_path))
         
         logger.info(f"Found {len(files)} files to process in {folder_path}")
         
         return self.process_batch(files, progress_callback)
     
+    def iter_folder_files(self, folder_path: Path) -> Iterator[Path]:
+        """Yield supported files in a folder using a single directory read
+        
+        Args:
+            folder_path: Folder to scan
+            
+        Yields:
+            Paths of regular files with a supported extension (any case)
+        """
+        for path in scan_images(folder_path, self._extension_set):
+            yield Path(path)
+    
     def shutdown(self):
-        """Request graceful shutdown"""
+        """Request graceful shutdown and release the model
+        
+        Long-running callers (e.g. the folder monitor) keep a warm model across
+        batches; it is released here, or when the running batch finishes.
+        """
         self._shutdown_requested = True
         logger.info("Shutdown requested")
+        
+        if not self.is_running:
+            self._cleanup_model()
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get processing statistics
@@ -381,6 +701,20 @@ class BackgroundProcessor:
         Returns:
             Memory usage information
         """
+        if _PAGE_SIZE:
+            # Linux: one read of /proc/self/statm instead of psutil's several /proc files
+            try:
+                with open("/proc/self/statm", "rb") as statm:
+                    vms_pages, rss_pages = statm.read().split()[:2]
+                rss = int(rss_pages) * _PAGE_SIZE
+                return {
+                    "rss_mb": rss / 1024 / 1024,
+                    "vms_mb": int(vms_pages) * _PAGE_SIZE / 1024 / 1024,
+                    "percent": rss / _TOTAL_MEMORY * 100 if _TOTAL_MEMORY else 0.0
+                }
+            except (OSError, ValueError):
+                pass
+        
         process = psutil.Process()
         memory_info = process.memory_info()
         
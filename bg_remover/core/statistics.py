@@ -1,19 +1,87 @@
+import math
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from dataclasses import dataclass, field
 import threading
 
+class _Shard:
+    """Tallies owned by a single thread (written only by that thread)"""
+    
+    __slots__ = ("processed", "failed", "time", "size", "min_time", "max_time")
+    
+    def __init__(self):
+        self.processed = 0
+        self.failed = 0
+        self.time = 0.0
+        self.size = 0
+        self.min_time = math.inf
+        self.max_time = -math.inf
+    
+    def add_time(self, processing_time: float):
+        """Record one success"""
+        self.processed += 1
+        self.time += processing_time
+        if processing_time < self.min_time:
+            self.min_time = processing_time
+        if processing_time > self.max_time:
+            self.max_time = processing_time
+    
+    def merge(self, other: "_Shard"):
+        """Add another shard's tallies to this one"""
+        self.processed += other.processed
+        self.failed += other.failed
+        self.time += other.time
+        self.size += other.size
+        self.min_time = min(self.min_time, other.min_time)
+        self.max_time = max(self.max_time, other.max_time)
+
 @dataclass
 class ProcessingStats:
-    """Thread-safe processing statistics"""
-    
-    total_processed: int = 0
-    total_failed: int = 0
-    total_processing_time: float = 0.0
-    total_file_size: int = 0
-    processing_times: List[float] = field(default_factory=list)
-    start_time: float = field(default_factory=time.time)
+    """Thread-safe processing statistics
+    
+    Each worker thread updates its own shard without locking; readers sum
+    the shards. Shards of finished threads are merged into one retired
+    shard so short-lived pool threads don't accumulate.
+    """
+    
+    _start: float = field(default_factory=time.perf_counter)
     _lock: threading.Lock = field(default_factory=threading.Lock)
+    _local: threading.local = field(default_factory=threading.local)
+    _shards: List[Tuple[threading.Thread, _Shard]] = field(default_factory=list)
+    _retired: _Shard = field(default_factory=_Shard)
+    
+    def _shard(self) -> _Shard:
+        """Get the calling thread's shard, registering it on first use"""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard()
+            with self._lock:
+                # Publish new objects instead of mutating the current ones, so
+                # readers can sum a snapshot outside the lock
+                live = []
+                retired = _Shard()
+                retired.merge(self._retired)
+                for thread, other in self._shards:
+                    if thread.is_alive():
+                        live.append((thread, other))
+                    else:
+                        retired.merge(other)
+                live.append((threading.current_thread(), shard))
+                self._shards = live
+                self._retired = retired
+            self._local.shard = shard
+        return shard
+    
+    def _totals(self) -> _Shard:
+        """Sum all shards into a snapshot"""
+        with self._lock:
+            retired, shards = self._retired, self._shards
+        
+        total = _Shard()
+        total.merge(retired)
+        for _, shard in shards:
+            total.merge(shard)
+        return total
     
     def add_success(self, processing_time: float, file_size: int):
         """Add successful processing record
@@ -22,11 +90,9 @@ class ProcessingStats:
             processing_time: Time taken to process
             file_size: Size of processed file in bytes
         """
-        with self._lock:
-            self.total_processed += 1
-            self.total_processing_time += processing_time
-            self.total_file_size += file_size
-            self.processing_times.append(processing_time)
+        shard = self._shard()
+        shard.add_time(processing_time)
+        shard.size += file_size
     
     def add_failure(self, file_size: int):
         """Add failed processing record
@@ -34,40 +100,74 @@ class ProcessingStats:
         Args:
             file_size: Size of failed file in bytes
         """
-        with self._lock:
-            self.total_failed += 1
-            self.total_file_size += file_size
+        shard = self._shard()
+        shard.failed += 1
+        shard.size += file_size
+    
+    @property
+    def total_processed(self) -> int:
+        """Get number of successfully processed files"""
+        return self._totals().processed
+    
+    @property
+    def total_failed(self) -> int:
+        """Get number of failed files"""
+        return self._totals().failed
+    
+    @property
+    def total_processing_time(self) -> float:
+        """Get total processing time of successful files"""
+        return self._totals().time
+    
+    @property
+    def total_file_size(self) -> int:
+        """Get total size of processed and failed files in bytes"""
+        return self._totals().size
     
     @property
     def total_files(self) -> int:
         """Get total number of files processed (success + failed)"""
-        return self.total_processed + self.total_failed
+        totals = self._totals()
+        return totals.processed + totals.failed
     
     @property
     def success_rate(self) -> float:
         """Get success rate as percentage"""
-        if self.total_files == 0:
-            return 0.0
-        return (self.total_processed / self.total_files) * 100
+        return self._success_rate(self._totals())
     
     @property
     def average_processing_time(self) -> float:
         """Get average processing time per file"""
-        if not self.processing_times:
-            return 0.0
-        return sum(self.processing_times) / len(self.processing_times)
+        return self._average_processing_time(self._totals())
     
     @property
     def files_per_second(self) -> float:
         """Get processing speed in files per second"""
-        if self.total_processing_time == 0:
-            return 0.0
-        return self.total_processed / self.total_processing_time
+        return self._files_per_second(self._totals())
     
     @property
     def total_runtime(self) -> float:
         """Get total runtime since start"""
-        return time.time() - self.start_time
+        return time.perf_counter() - self._start
+    
+    @staticmethod
+    def _success_rate(totals: _Shard) -> float:
+        total_files = totals.processed + totals.failed
+        if total_files == 0:
+            return 0.0
+        return (totals.processed / total_files) * 100
+    
+    @staticmethod
+    def _average_processing_time(totals: _Shard) -> float:
+        if not totals.processed:
+            return 0.0
+        return totals.time / totals.processed
+    
+    @staticmethod
+    def _files_per_second(totals: _Shard) -> float:
+        if totals.time == 0:
+            return 0.0
+        return totals.processed / totals.time
     
     def get_summary(self) -> Dict[str, Any]:
         """Get comprehensive statistics summary
@@ -75,27 +175,26 @@ class ProcessingStats:
         Returns:
             Statistics dictionary
         """
-        with self._lock:
-            return {
-                "total_processed": self.total_processed,
-                "total_failed": self.total_failed,
-                "total_files": self.total_files,
-                "success_rate": round(self.success_rate, 2),
-                "total_processing_time": round(self.total_processing_time, 2),
-                "average_processing_time": round(self.average_processing_time, 2),
-                "files_per_second": round(self.files_per_second, 2),
-                "total_file_size_mb": round(self.total_file_size / 1024 / 1024, 2),
-                "total_runtime": round(self.total_runtime, 2),
-                "min_processing_time": round(min(self.processing_times), 2) if self.processing_times else 0,
-                "max_processing_time": round(max(self.processing_times), 2) if self.processing_times else 0,
-            }
+        totals = self._totals()
+        return {
+            "total_processed": totals.processed,
+            "total_failed": totals.failed,
+            "total_files": totals.processed + totals.failed,
+            "success_rate": round(self._success_rate(totals), 2),
+            "total_processing_time": round(totals.time, 2),
+            "average_processing_time": round(self._average_processing_time(totals), 2),
+            "files_per_second": round(self._files_per_second(totals), 2),
+            "total_file_size_mb": round(totals.size / 1024 / 1024, 2),
+            "total_runtime": round(self.total_runtime, 2),
+            "min_processing_time": round(totals.min_time, 2) if totals.processed else 0,
+            "max_processing_time": round(totals.max_time, 2) if totals.processed else 0,
+        }
     
     def reset(self):
         """Reset all statistics"""
         with self._lock:
-            self.total_processed = 0
-            self.total_failed = 0
-            self.total_processing_time = 0.0
-            self.total_file_size = 0
-            self.processing_times.clear()
-            self.start_time = time.time()
\ No newline at end of file
+            # Threads register fresh shards on their next update
+            self._local = threading.local()
+            self._shards = []
+            self._retired = _Shard()
+            self._start = time.perf_counter()
@@ -1,8 +1,19 @@
 """Background removal models package"""
 
 from .base import BaseModel
-from .transparent_bg import TransparentBackgroundModel
-from .rembg_model import RembgModel
 from .factory import ModelFactory
 
 __all__ = ["BaseModel", "TransparentBackgroundModel", "RembgModel", "SAMModel", "ModelFactory"]
+
+def __getattr__(name):
+    """Lazily import model implementations so unused models cost nothing at import time"""
+    if name == "TransparentBackgroundModel":
+        from .transparent_bg import TransparentBackgroundModel
+        return TransparentBackgroundModel
+    if name == "RembgModel":
+        from .rembg_model import RembgModel
+        return RembgModel
+    if name == "SAMModel":
+        from .sam_model import SAMModel
+        return SAMModel
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,14 +1,26 @@
 from abc import ABC, abstractmethod
-from typing import Union, Any, Dict
+from typing import Union, Any, Dict, List
 import numpy as np
 from PIL import Image
 import logging
+import threading
+
+from ..utils.device_utils import cuda_available
 
 logger = logging.getLogger(__name__)
 
 class BaseModel(ABC):
     """Abstract base class for background removal models"""
     
+    # Serializes first-use initialization per model class (also guards sessions
+    # shared between instances); each subclass gets its own lock so a slow
+    # initialize() doesn't block other models
+    _init_lock = threading.Lock()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._init_lock = threading.Lock()
+    
     def __init__(self, device: str = "auto", **kwargs):
         """Initialize the model
         
@@ -21,13 +33,9 @@ class BaseModel(ABC):
         self._initialized = False
         
     def _resolve_device(self, device: str) -> str:
-        """Resolve device setting to actual device"""
+        """Resolve device setting to actual device (CUDA is probed once per process)"""
         if device == "auto":
-            try:
-                import torch
-                return "cuda" if torch.cuda.is_available() else "cpu"
-            except ImportError:
-                return "cpu"
+            return "cuda" if cuda_available() else "cpu"
         return device
     
     @abstractmethod
@@ -47,15 +55,48 @@ class BaseModel(ABC):
         """
         pass
     
+    def process_batch(self, images: List[Union[Image.Image, np.ndarray]]) -> List[Image.Image]:
+        """Process several images to remove background
+        
+        The default implementation processes images one by one; models that
+        support batched inference should override it.
+        
+        Args:
+            images: Input images as PIL Images or numpy arrays
+            
+        Returns:
+            Processed images, in input order
+        """
+        return [self.process_image(image) for image in images]
+    
     @abstractmethod
     def cleanup(self):
         """Clean up model resources"""
         pass
     
+    @classmethod
+    def release_shared_resources(cls):
+        """Free resources cached across instances of this model class
+        
+        cleanup() only releases what an instance holds; models that share
+        sessions between instances override this to drop them.
+        """
+        pass
+    
+    def _ensure_initialized(self):
+        """Initialize on first use, safely when several threads race
+        
+        Double-checked: once initialized this is a single attribute read;
+        the lock is only taken while initialization hasn't happened yet.
+        """
+        if not self._initialized:
+            with type(self)._init_lock:
+                if not self._initialized:
+                    self.initialize()
+    
     def __enter__(self):
         """Context manager entry"""
-        if not self._initialized:
-            self.initialize()
+        self._ensure_initialized()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -1,19 +1,26 @@
-from typing import Dict, Type, Any
+from typing import Dict, Type, Any, Union
+from functools import lru_cache
+import importlib
 import logging
 
 from .base import BaseModel
-from .transparent_bg import TransparentBackgroundModel
-from .rembg_model import RembgModel
-from .sam_model import SAMModel
 
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def _import_model_class(path: str) -> Type[BaseModel]:
+    """Import a model class from a "package.module:ClassName" path (once per path)"""
+    module_name, class_name = path.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
 class ModelFactory:
-    _models: Dict[str, Type[BaseModel]] = {
-        "transparent-background": TransparentBackgroundModel,
-        "rembg": RembgModel,
-        "sam": SAMModel,
+    # Built-in models are referenced by import path so a model's module (and
+    # its dependencies) is only imported when that model is created
+    _models: Dict[str, Union[str, Type[BaseModel]]] = {
+        "transparent-background": "bg_remover.models.transparent_bg:TransparentBackgroundModel",
+        "rembg": "bg_remover.models.rembg_model:RembgModel",
+        "sam": "bg_remover.models.sam_model:SAMModel",
     }
     
     @classmethod
@@ -22,7 +29,7 @@ class ModelFactory:
         
         Args:
             name: Model name
-            model_class: Model class
+            model_class: Model class, or a "package.module:ClassName" import path
         """
         cls._models[name] = model_class
         logger.info(f"Registered model: {name}")
@@ -47,11 +54,26 @@ class ModelFactory:
             available = ", ".join(cls.get_available_models())
             raise ValueError(f"Unknown model: {name}. Available models: {available}")
         
-        model_class = cls._models[name]
+        model_class = cls.get_model_class(name)
         logger.info(f"Creating model: {name}")
         
         return model_class(**kwargs)
     
+    @classmethod
+    def get_model_class(cls, name: str) -> Type[BaseModel]:
+        """Get the class registered for a model, importing it on first use
+        
+        Args:
+            name: Model name
+            
+        Returns:
+            Model class
+        """
+        model_class = cls._models[name]
+        if isinstance(model_class, str):
+            model_class = _import_model_class(model_class)
+        return model_class
+    
     @classmethod
     def is_model_available(cls, name: str) -> bool:
         """Check if a model is available
@@ -1,4 +1,5 @@
-from typing import Union
+from functools import lru_cache
+from typing import Union, List, Optional, Tuple
 import numpy as np
 from PIL import Image
 import logging
@@ -21,7 +22,28 @@ class RembgModel(BaseModel):
         super().__init__(device, **kwargs)
         self.model_name = model_name
         self.session = None
+        self._rembg = None  # rembg module, imported once in initialize()
         
+    @classmethod
+    @lru_cache(maxsize=8)
+    def _get_session(cls, model_name: str, providers: Optional[Tuple[str, ...]] = None):
+        """Create (once per model name and ONNX providers) a rembg session
+        
+        ONNX Runtime sessions are safe to run from several threads, so one
+        session serves every model instance and worker thread.
+        
+        Args:
+            model_name: rembg model name
+            providers: ONNX Runtime execution providers (rembg's default if None)
+            
+        Returns:
+            rembg session
+        """
+        import rembg
+        if providers is None:
+            return rembg.new_session(model_name)
+        return rembg.new_session(model_name, providers=list(providers))
+    
     def initialize(self):
         """Initialize the model"""
         if self._initialized:
@@ -30,11 +52,13 @@ class RembgModel(BaseModel):
         try:
             # Import here to avoid issues if package not installed
             import rembg
+            self._rembg = rembg
             
             logger.info(f"Initializing Rembg model ({self.model_name}) on {self.device}")
             
-            # Create session
-            self.session = rembg.new_session(self.model_name)
+            # Sessions are shared by all instances using the same model/providers
+            providers = self.options.get("providers")
+            self.session = self._get_session(self.model_name, tuple(providers) if providers else None)
             
             self._initialized = True
             logger.info(f"Rembg model ({self.model_name}) initialized successfully")
@@ -55,35 +79,52 @@ class RembgModel(BaseModel):
         Returns:
             Image with transparent background
         """
-        if not self._initialized:
-            self.initialize()
+        self._ensure_initialized()
             
         try:
-            import rembg
+            remove = self._rembg.remove
             
-            # Convert to PIL Image if needed
+            # rembg accepts arrays directly and returns an RGBA array for them
             if isinstance(image, np.ndarray):
-                image = Image.fromarray(image)
+                return Image.fromarray(remove(image, session=self.session), 'RGBA')
             
-            # Ensure RGB mode for processing
-            if image.mode not in ['RGB', 'RGBA']:
+            # Ensure RGB mode for processing (RGB/RGBA are used as-is)
+            if image.mode not in ('RGB', 'RGBA'):
                 image = image.convert('RGB')
             
-            # Process with rembg
-            result = rembg.remove(image, session=self.session)
-            
-            # Ensure RGBA mode
-            if result.mode != 'RGBA':
-                result = result.convert('RGBA')
-            
-            return result
+            # Process with rembg (cutouts are always RGBA)
+            return remove(image, session=self.session)
             
         except Exception as e:
             logger.error(f"Error processing image with Rembg: {e}")
             raise
     
+    def process_batch(self, images: List[Union[Image.Image, np.ndarray]]) -> List[Image.Image]:
+        """Process several images with the model's single rembg session
+        
+        rembg has no batched inference API, so the images run through the
+        same session one after another; the session is set up once per batch.
+        
+        Args:
+            images: Input images
+            
+        Returns:
+            Images with transparent background, in input order
+        """
+        self._ensure_initialized()
+        return [self.process_image(image) for image in images]
+    
+    @classmethod
+    def release_shared_resources(cls):
+        """Drop the cached rembg sessions so their memory can be freed"""
+        cls._get_session.cache_clear()
+    
     def cleanup(self):
-        """Clean up model resources"""
+        """Clean up model resources
+        
+        The shared session stays cached for reuse and keeps its memory; call
+        release_shared_resources() to free it.
+        """
         if self.session is not None:
             try:
                 # Rembg sessions don't have explicit cleanup
@@ -1,15 +1,47 @@
-from typing import Union
+from typing import Union, Optional, List, Dict, Tuple
+from concurrent.futures import Future
+import hashlib
+import importlib.util
 import os
+import threading
+import urllib.error
 import urllib.request
 from pathlib import Path
 import numpy as np
 from PIL import Image
 import logging
 
+# Advisory file locks (POSIX only)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 from .base import BaseModel
 
 logger = logging.getLogger(__name__)
 
+# Bytes read/written per step when streaming a checkpoint download
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Checkpoint URLs and file names per model type
+CHECKPOINTS = {
+    "vit_b": ("https://dl.fbaipublicfiles.com/segment_anything/sam_vit_b_01ec64.pth", "sam_vit_b_01ec64.pth"),
+    "vit_l": ("https://dl.fbaipublicfiles.com/segment_anything/sam_vit_l_0b3195.pth", "sam_vit_l_0b3195.pth"),
+    "vit_h": ("https://dl.fbaipublicfiles.com/segment_anything/sam_vit_h_4b8939.pth", "sam_vit_h_4b8939.pth")
+}
+
+# Checkpoint downloads started in the background, keyed by (pid, checkpoint path)
+_prefetch_lock = threading.Lock()
+_prefetches: Dict[Tuple[int, Path], Future] = {}
+
+def _content_range_total(header: Optional[str]) -> Optional[int]:
+    """Get the full resource size from a Content-Range header ("bytes 0-9/10", "bytes */10")"""
+    if not header or "/" not in header:
+        return None
+    total = header.rsplit("/", 1)[1].strip()
+    return int(total) if total.isdigit() else None
+
 class SAMModel(BaseModel):
     """Segment Anything Model implementation"""
     
@@ -24,19 +56,142 @@ class SAMModel(BaseModel):
         super().__init__(device, **kwargs)
         self.model_type = model_type
         self.predictor = None
+        self._torch = None  # torch module, imported once in initialize()
+    
+    @classmethod
+    def prefetch_checkpoint(cls, model_type: str, sha256: Optional[str] = None) -> Optional[Future]:
+        """Download a checkpoint on a background thread (once per checkpoint)
+        
+        Args:
+            model_type: Model type ('vit_b', 'vit_l', 'vit_h')
+            sha256: Expected SHA-256 hex digest (verified if given)
+            
+        Returns:
+            Future resolving to the local checkpoint path, or None for an
+            unsupported model type
+        """
+        if model_type not in CHECKPOINTS:
+            return None
+        
+        url, filename = CHECKPOINTS[model_type]
+        checkpoint_path = Path.home() / ".cache" / "sam" / filename
         
-    def _download_checkpoint(self, url: str, checkpoint_path: Path) -> str:
-        """Download SAM checkpoint if not exists"""
+        # Keyed by process too: a forked child must not wait on its parent's thread
+        key = (os.getpid(), checkpoint_path)
+        with _prefetch_lock:
+            future = _prefetches.get(key)
+            # A failed download is retried by the next caller
+            if future is None or (future.done() and future.exception() is not None):
+                future = Future()
+                
+                def download():
+                    try:
+                        future.set_result(cls._download_checkpoint(url, checkpoint_path, sha256))
+                    except BaseException as e:
+                        future.set_exception(e)
+                
+                threading.Thread(target=download, name=f"sam-prefetch-{model_type}", daemon=True).start()
+                _prefetches[key] = future
+        
+        return future
+    
+    @staticmethod
+    def _download_checkpoint(url: str, checkpoint_path: Path, sha256: Optional[str] = None) -> str:
+        """Download SAM checkpoint if not exists
+        
+        The download is streamed to a ".part" file next to the checkpoint and
+        resumed from there (HTTP Range) if a previous attempt was interrupted.
+        The file is renamed into place only once it is complete.
+        
+        Args:
+            url: Checkpoint URL
+            checkpoint_path: Final checkpoint location
+            sha256: Expected SHA-256 hex digest (verified if given)
+            
+        Returns:
+            Path to the local checkpoint
+        """
         if checkpoint_path.exists():
             logger.info(f"Using existing checkpoint: {checkpoint_path}")
             return str(checkpoint_path)
             
-        logger.info(f"Downloading SAM checkpoint: {url}")
         checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = checkpoint_path.with_name(checkpoint_path.name + ".lock")
+        
+        # Only one process downloads at a time (e.g. CPU inference workers);
+        # the others wait here and then find the finished checkpoint
+        with open(lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            if checkpoint_path.exists():
+                logger.info(f"Using existing checkpoint: {checkpoint_path}")
+                return str(checkpoint_path)
+            return SAMModel._fetch_checkpoint(url, checkpoint_path, sha256)
+    
+    @staticmethod
+    def _fetch_checkpoint(url: str, checkpoint_path: Path, sha256: Optional[str] = None) -> str:
+        """Stream a checkpoint download into place (see _download_checkpoint)"""
+        logger.info(f"Downloading SAM checkpoint: {url}")
+        part_path = checkpoint_path.with_name(checkpoint_path.name + ".part")
         
         try:
-            urllib.request.urlretrieve(url, checkpoint_path)
-            logger.info(f"Downloaded checkpoint to: {checkpoint_path}")
+            existing = part_path.stat().st_size if part_path.exists() else 0
+            digest = hashlib.sha256()
+            request = urllib.request.Request(url, headers={"Range": f"bytes={existing}-"} if existing else {})
+            
+            try:
+                response = urllib.request.urlopen(request)
+            except urllib.error.HTTPError as e:
+                if e.code != 416:
+                    raise
+                # 416: nothing left past the partial file; it is only complete
+                # if its size matches the total the server reports
+                if _content_range_total(e.headers.get("Content-Range")) != existing:
+                    logger.info("Partial download does not match the server's file, restarting download")
+                    part_path.unlink()
+                    return SAMModel._fetch_checkpoint(url, checkpoint_path, sha256)
+                response = None
+            
+            if response is not None:
+                with response:
+                    resumed = existing and response.status == 206
+                    if existing and not resumed:
+                        logger.info("Server ignored resume request, restarting download")
+                    elif resumed:
+                        logger.info(f"Resuming download at {existing / 1024 / 1024:.1f} MB")
+                    
+                    # Full size: the Content-Range total when resuming, else Content-Length
+                    content_length = response.headers.get("Content-Length")
+                    if resumed:
+                        expected_size = _content_range_total(response.headers.get("Content-Range"))
+                        if expected_size is None and content_length:
+                            expected_size = existing + int(content_length)
+                    else:
+                        expected_size = int(content_length) if content_length else None
+                    
+                    if resumed:
+                        with open(part_path, "rb") as f:
+                            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                                digest.update(chunk)
+                    
+                    with open(part_path, "ab" if resumed else "wb") as f:
+                        for chunk in iter(lambda: response.read(DOWNLOAD_CHUNK_SIZE), b""):
+                            f.write(chunk)
+                            digest.update(chunk)
+                
+                if expected_size is not None and part_path.stat().st_size != expected_size:
+                    raise IOError(f"Incomplete download: got {part_path.stat().st_size} of {expected_size} bytes")
+            else:
+                with open(part_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                        digest.update(chunk)
+            
+            if sha256 and digest.hexdigest() != sha256.lower():
+                part_path.unlink()
+                raise IOError(f"Checksum mismatch for {checkpoint_path.name}: expected {sha256}, got {digest.hexdigest()}")
+            
+            os.replace(part_path, checkpoint_path)
+            logger.info(f"Downloaded checkpoint to: {checkpoint_path} (sha256 {digest.hexdigest()})")
             return str(checkpoint_path)
         except Exception as e:
             logger.error(f"Failed to download checkpoint: {e}")
@@ -48,25 +203,23 @@ class SAMModel(BaseModel):
             return
             
         try:
-            from segment_anything import sam_model_registry, SamPredictor
+            if importlib.util.find_spec("segment_anything") is None:
+                raise ImportError("No module named 'segment_anything'")
             
-            logger.info(f"Initializing SAM model ({self.model_type}) on {self.device}")
+            if self.model_type not in CHECKPOINTS:
+                raise ValueError(f"Unsupported model type: {self.model_type}")
             
-            # Checkpoint URLs and local paths
-            checkpoint_info = {
-                "vit_b": ("https://dl.fbaipublicfiles.com/segment_anything/sam_vit_b_01ec64.pth", "sam_vit_b_01ec64.pth"),
-                "vit_l": ("https://dl.fbaipublicfiles.com/segment_anything/sam_vit_l_0b3195.pth", "sam_vit_l_0b3195.pth"), 
-                "vit_h": ("https://dl.fbaipublicfiles.com/segment_anything/sam_vit_h_4b8939.pth", "sam_vit_h_4b8939.pth")
-            }
+            # Start fetching the checkpoint only once the package is known to be
+            # installed, so the download overlaps the (slow) torch imports
+            checkpoint = self.prefetch_checkpoint(self.model_type, self.options.get("checkpoint_sha256"))
             
-            if self.model_type not in checkpoint_info:
-                raise ValueError(f"Unsupported model type: {self.model_type}")
+            from segment_anything import sam_model_registry, SamPredictor
+            import torch
+            self._torch = torch
             
-            url, filename = checkpoint_info[self.model_type]
-            checkpoint_path = Path.home() / ".cache" / "sam" / filename
+            logger.info(f"Initializing SAM model ({self.model_type}) on {self.device}")
             
-            # Download checkpoint
-            local_checkpoint = self._download_checkpoint(url, checkpoint_path)
+            local_checkpoint = checkpoint.result()
             
             # Load model
             sam = sam_model_registry[self.model_type](checkpoint=local_checkpoint)
@@ -93,23 +246,22 @@ class SAMModel(BaseModel):
         Returns:
             Image with transparent background
         """
-        if not self._initialized:
-            self.initialize()
+        self._ensure_initialized()
             
         try:
-            import cv2
+            # SAM expects RGB; PIL handles palette/grayscale/CMYK modes
+            if isinstance(image, Image.Image) and image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGB')
             
-            # Convert to numpy array
-            if isinstance(image, Image.Image):
-                image_array = np.array(image)
-            else:
-                image_array = image
-                
-            # SAM expects RGB
-            if len(image_array.shape) == 3 and image_array.shape[2] == 3:
+            # View as numpy array (arrays pass through, PIL images are copied once)
+            image_array = np.asarray(image)
+            
+            if image_array.ndim == 3 and image_array.shape[2] == 4:
+                image_rgb = image_array[..., :3]
+            elif image_array.ndim == 3 and image_array.shape[2] == 3:
                 image_rgb = image_array
             else:
-                image_rgb = cv2.cvtColor(image_array, cv2.COLOR_BGR2RGB)
+                raise ValueError(f"Expected an RGB or RGBA image, got array of shape {image_array.shape}")
             
             # Set image for SAM
             self.predictor.set_image(image_rgb)
@@ -130,10 +282,15 @@ class SAMModel(BaseModel):
             best_mask_idx = np.argmax(scores)
             best_mask = masks[best_mask_idx]
             
-            # Create RGBA output
-            result = np.zeros((image_array.shape[0], image_array.shape[1], 4), dtype=np.uint8)
-            result[:, :, :3] = image_array[:, :, :3]  # RGB channels
-            result[:, :, 3] = (best_mask * 255).astype(np.uint8)  # Alpha channel
+            # Alpha channel; SAM masks are boolean, so scale in place without a float buffer
+            if best_mask.dtype == np.bool_:
+                alpha = best_mask.astype(np.uint8)
+                alpha *= 255
+            else:
+                alpha = (best_mask * 255).astype(np.uint8)
+            
+            # Create RGBA output in a single pass
+            result = np.concatenate([image_array[:, :, :3], alpha[:, :, None]], axis=2)
             
             return Image.fromarray(result, 'RGBA')
             
@@ -141,14 +298,30 @@ class SAMModel(BaseModel):
             logger.error(f"Error processing image with SAM: {e}")
             raise
     
+    def process_batch(self, images: List[Union[Image.Image, np.ndarray]]) -> List[Image.Image]:
+        """Process several images under a single torch inference context
+        
+        SAM embeds one image per set_image call and each image uses a single
+        center-point prompt, so there is no prompt batch to merge.
+        
+        Args:
+            images: Input images
+            
+        Returns:
+            Images with transparent background, in input order
+        """
+        self._ensure_initialized()
+        
+        with self._torch.inference_mode():
+            return [self.process_image(image) for image in images]
+    
     def cleanup(self):
         """Clean up model resources"""
         if self.predictor is not None:
             try:
                 # Clear CUDA cache if using GPU
                 if self.device == "cuda":
-                    import torch
-                    torch.cuda.empty_cache()
+                    self._torch.cuda.empty_cache()
             except:
                 pass
             self.predictor = None
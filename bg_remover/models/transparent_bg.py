@@ -1,9 +1,10 @@
-from typing import Union
+from typing import Union, List
 import numpy as np
 from PIL import Image
 import logging
 
 from .base import BaseModel
+from ..utils.device_utils import cuda_available
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,7 @@ class TransparentBackgroundModel(BaseModel):
         self.quality = quality
         self.mode = mode
         self.model = None
+        self._torch = None  # torch module, imported once in initialize()
         
     def initialize(self):
         """Initialize the model"""
@@ -32,10 +34,11 @@ class TransparentBackgroundModel(BaseModel):
         try:
             import transparent_background
             import torch
+            self._torch = torch
             
             logger.info(f"Initializing Transparent Background model (mode: {self.mode}) on {self.device}")
             
-            if self.device == "cuda" and torch.cuda.is_available():
+            if self.device == "cuda" and cuda_available():
                 torch.cuda.empty_cache()
             
             # Initialize model with mode parameter
@@ -64,12 +67,14 @@ class TransparentBackgroundModel(BaseModel):
         Returns:
             Image with transparent background
         """
-        if not self._initialized:
-            self.initialize()
+        self._ensure_initialized()
             
         try:
-            # Convert to PIL Image if needed
+            # Remover.process needs a PIL Image; drop an alpha channel while
+            # converting rather than with a second RGBA -> RGB copy
             if isinstance(image, np.ndarray):
+                if image.ndim == 3 and image.shape[2] == 4:
+                    image = image[..., :3]
                 image = Image.fromarray(image)
             
             # Ensure RGB mode
@@ -82,9 +87,11 @@ class TransparentBackgroundModel(BaseModel):
             # Convert result to RGBA if needed
             if isinstance(result, np.ndarray):
                 if result.shape[2] == 3:
-                    # Add alpha channel
-                    alpha = np.ones((result.shape[0], result.shape[1], 1), dtype=result.dtype) * 255
-                    result = np.concatenate([result, alpha], axis=2)
+                    # Add an opaque alpha channel with a single allocation
+                    rgba = np.empty((result.shape[0], result.shape[1], 4), dtype=result.dtype)
+                    rgba[..., :3] = result
+                    rgba[..., 3] = 255
+                    result = rgba
                 result = Image.fromarray(result, 'RGBA')
             elif result.mode != 'RGBA':
                 result = result.convert('RGBA')
@@ -95,13 +102,29 @@ class TransparentBackgroundModel(BaseModel):
             logger.error(f"Error processing image with Transparent Background: {e}")
             raise
     
+    def process_batch(self, images: List[Union[Image.Image, np.ndarray]]) -> List[Image.Image]:
+        """Process several images under a single torch inference context
+        
+        Remover.process takes one image at a time (its output is resized to
+        each input's size), so images are not stacked into one tensor.
+        
+        Args:
+            images: Input images
+            
+        Returns:
+            Images with transparent background, in input order
+        """
+        self._ensure_initialized()
+        
+        with self._torch.inference_mode():
+            return [self.process_image(image) for image in images]
+    
     def cleanup(self):
         """Clean up model resources"""
         if self.model is not None:
             try:
-                import torch
-                if self.device == "cuda" and torch.cuda.is_available():
-                    torch.cuda.empty_cache()
+                if self.device == "cuda" and cuda_available():
+                    self._torch.cuda.empty_cache()
             except:
                 pass
         self.model = None
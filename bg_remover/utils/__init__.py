@@ -1,7 +1,7 @@
 """Utility functions package"""
 
 from .logging_setup import setup_logging
-from .device_utils import detect_device, get_system_info
-from .file_utils import ensure_directory, get_file_size_mb, is_image_file
+from .device_utils import cuda_available, cuda_device_info, detect_device, get_optimal_batch_size, get_system_info
+from .file_utils import ensure_directory, get_file_size_mb, is_image_file, scan_images
 
-__all__ = ["setup_logging", "detect_device", "get_system_info", "ensure_directory", "get_file_size_mb", "is_image_file"]
\ No newline at end of file
+__all__ = ["setup_logging", "cuda_available", "cuda_device_info", "detect_device", "get_optimal_batch_size", "get_system_info", "ensure_directory", "get_file_size_mb", "is_image_file", "scan_images"]
\ No newline at end of file
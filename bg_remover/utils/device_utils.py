@@ -1,28 +1,63 @@
+import os
 import platform
 import logging
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
-def detect_device() -> str:
-    """Detect best available device for processing
+@lru_cache(maxsize=1)
+def cuda_available() -> bool:
+    """Check (once per process) whether PyTorch can use CUDA
     
     Returns:
-        Device string ('cuda', 'cpu')
+        True if CUDA is available, False if not or if PyTorch is missing
     """
     try:
         import torch
-        if torch.cuda.is_available():
-            device_count = torch.cuda.device_count()
-            device_name = torch.cuda.get_device_name(0) if device_count > 0 else "Unknown"
-            logger.info(f"CUDA available: {device_count} device(s), Primary: {device_name}")
-            return "cuda"
-        else:
-            logger.info("CUDA not available, using CPU")
-            return "cpu"
     except ImportError:
-        logger.info("PyTorch not available, using CPU")
-        return "cpu"
+        return False
+    return torch.cuda.is_available()
+
+@lru_cache(maxsize=1)
+def cuda_device_info() -> Tuple[int, str]:
+    """Get (once per process) the CUDA device count and primary device name
+    
+    Returns:
+        Tuple of (device count, primary device name)
+    """
+    if not cuda_available():
+        return 0, "Unknown"
+    import torch
+    device_count = torch.cuda.device_count()
+    device_name = torch.cuda.get_device_name(0) if device_count > 0 else "Unknown"
+    return device_count, device_name
+
+def detect_device() -> str:
+    """Detect best available device for processing
+    
+    Returns:
+        Device string ('cuda', 'cpu')
+    """
+    if cuda_available():
+        device_count, device_name = cuda_device_info()
+        logger.info(f"CUDA available: {device_count} device(s), Primary: {device_name}")
+        return "cuda"
+    
+    logger.info("CUDA not available, using CPU")
+    return "cpu"
+
+def get_optimal_batch_size(pending_files: int) -> int:
+    """Derive a worker count from the CPU count and the number of pending files
+    
+    Args:
+        pending_files: Number of files waiting to be processed
+        
+    Returns:
+        Batch size (number of parallel workers), at least 1
+    """
+    cpu_count = os.cpu_count() or 1
+    return min(cpu_count, max(1, pending_files // cpu_count))
 
 def get_system_info() -> Dict[str, Any]:
     """Get system information
@@ -52,10 +87,10 @@ def get_system_info() -> Dict[str, Any]:
     try:
         import torch
         info["torch_version"] = torch.__version__
-        info["torch_cuda_available"] = torch.cuda.is_available()
-        if torch.cuda.is_available():
+        info["torch_cuda_available"] = cuda_available()
+        if info["torch_cuda_available"]:
             info["torch_cuda_version"] = torch.version.cuda
-            info["torch_cuda_device_count"] = torch.cuda.device_count()
+            info["torch_cuda_device_count"] = cuda_device_info()[0]
     except ImportError:
         pass
     
@@ -1,10 +1,18 @@
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'})
+
+@lru_cache(maxsize=32)
+def _extension_set(extensions: Tuple[str, ...]) -> frozenset:
+    """Build (once per distinct extension list) a lower-cased lookup set"""
+    return frozenset(ext.lower() for ext in extensions)
+
 def ensure_directory(path: str) -> Path:
     """Ensure directory exists
     
@@ -43,7 +51,25 @@ def is_image_file(file_path: Path, extensions: List[str] = None) -> bool:
     Returns:
         True if file is an image
     """
-    if extensions is None:
-        extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp']
+    valid = _DEFAULT_IMAGE_EXTENSIONS if extensions is None else _extension_set(tuple(extensions))
+    return file_path.suffix.lower() in valid
+
+def scan_images(root: str, extensions: List[str] = None) -> Iterator[str]:
+    """Yield image files in a directory using a single scandir pass
+    
+    Matching works on the directory entry names, so no Path objects are
+    built and non-matching entries are never stat'ed.
     
-    return file_path.suffix.lower() in [ext.lower() for ext in extensions]
\ No newline at end of file
+    Args:
+        root: Directory to scan
+        extensions: List of valid extensions (common image types if None)
+        
+    Yields:
+        Paths (as strings) of regular files with a valid extension, any case
+    """
+    valid = _DEFAULT_IMAGE_EXTENSIONS if extensions is None else _extension_set(tuple(extensions))
+    with os.scandir(root) as entries:
+        for entry in entries:
+            suffix = os.path.splitext(entry.name)[1]
+            if (suffix in valid or suffix.lower() in valid) and entry.is_file(follow_symlinks=False):
+                yield entry.path
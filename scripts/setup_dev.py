@@ -7,21 +7,218 @@ This script sets up a complete development environment for bg-remover
 including all dependencies, pre-commit hooks, and development tools.
 """
 
+import os
+import re
+import shlex
 import subprocess
 import sys
 import platform
+from collections import deque
+from importlib import metadata
 from pathlib import Path
 
-def run_command(cmd, shell=False):
-    """Run a command and return success status"""
-    try:
-        result = subprocess.run(cmd, shell=shell, check=True, capture_output=True, text=True)
-        print(f"✓ {' '.join(cmd) if isinstance(cmd, list) else cmd}")
+# Persistent wheel cache so re-runs don't download or rebuild packages again
+PIP_CACHE_DIR = os.environ.setdefault("PIP_CACHE_DIR", str(Path.home() / ".cache" / "pip"))
+
+# Prefer prebuilt wheels over building sdists from source
+PIP_INSTALL = [sys.executable, "-m", "pip", "install", "--prefer-binary"]
+
+# Written once the installation test passes, so re-runs can skip it
+SETUP_MARKER = ".bg_remover_setup_ok"
+
+# Output lines repeated when a command fails
+OUTPUT_TAIL_LINES = 200
+
+DEV_PACKAGES = [
+    "pytest>=6.0.0",
+    "pytest-cov>=2.12.0",
+    "pytest-xdist>=3.0",
+    "black>=21.0.0",
+    "flake8>=3.9.0",
+    "pre-commit>=2.15.0",
+    "sphinx>=4.0.0",
+    "sphinx-rtd-theme>=0.5.0",
+]
+
+TORCH_INDEX_BASE = "https://download.pytorch.org/whl"
+
+# PyTorch CUDA wheel tags, newest first, with the minimum NVIDIA driver
+# version (Linux, Windows) and GPU compute capability each one supports
+CUDA_WHEEL_TAGS = [
+    ("cu128", (570, 26), (570, 65), 7.5),
+    ("cu121", (530, 30), (531, 14), 5.0),
+    ("cu118", (520, 61), (520, 6), 3.7),
+]
+
+MODEL_PACKAGES = [
+    "transparent-background==1.2.5 --no-deps",
+    "easydict", "kornia", "opencv-python", "pyvirtualcam",
+    "rembg>=2.0.0"
+]
+
+def run_command(cmd, shell=False, label=None):
+    """Run a command, streaming its output, and return success status
+    
+    Args:
+        cmd: Command to run
+        shell: Run the command through the shell
+        label: Optional prefix for output lines, used for concurrent tasks
+    """
+    prefix = f"[{label}] " if label else ""
+    cmd_str = ' '.join(cmd) if isinstance(cmd, list) else cmd
+    # Only the tail is kept, to be repeated if the command fails
+    tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    
+    with subprocess.Popen(cmd, shell=shell, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          text=True, bufsize=1) as proc:
+        for line in proc.stdout:
+            tail.append(line)
+            sys.stdout.write(f"{prefix}{line}")
+        returncode = proc.wait()
+    
+    if returncode == 0:
+        print(f"{prefix}✓ {cmd_str}")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"✗ {' '.join(cmd) if isinstance(cmd, list) else cmd}")
-        print(f"  Error: {e.stderr}")
-        return False
+    
+    print(f"{prefix}✗ {cmd_str}")
+    print(f"{prefix}  Error (last {len(tail)} lines):")
+    for line in tail:
+        sys.stdout.write(f"{prefix}  {line}")
+    return False
+
+def get_setup_stamp():
+    """Identify the current interpreter and bg-remover install
+    
+    Returns:
+        Stamp string, or None if bg-remover is not installed
+    """
+    try:
+        package_version = metadata.version("bg-remover")
+    except metadata.PackageNotFoundError:
+        return None
+    return f"{sys.version}\n{package_version}\n"
+
+def group_packages(packages):
+    """Group package specs by their pip flags
+    
+    Args:
+        packages: Specs such as "rembg>=2.0.0" or "pkg==1.0 --no-deps"
+        
+    Returns:
+        Dict mapping a tuple of flags to a list of requirement tokens
+    """
+    groups = {}
+    for package in packages:
+        tokens = shlex.split(package)
+        flags = tuple(token for token in tokens if token.startswith("-"))
+        requirements = [token for token in tokens if not token.startswith("-")]
+        groups.setdefault(flags, []).extend(requirements)
+    return groups
+
+def install_packages(packages, label=None):
+    """Install packages with one pip call per flag combination
+    
+    If a batched call fails, the packages in that batch are retried one at a
+    time so a single broken package doesn't hide the rest.
+    
+    Args:
+        packages: Package specs to install
+        label: Optional output prefix passed to run_command
+        
+    Returns:
+        List of requirements that failed to install
+    """
+    failed = []
+    for flags, requirements in group_packages(packages).items():
+        base_cmd = PIP_INSTALL + list(flags)
+        if run_command(base_cmd + requirements, label=label):
+            continue
+        
+        for requirement in requirements:
+            if not run_command(base_cmd + [requirement], label=label):
+                failed.append(requirement)
+    return failed
+
+def read_build_requires():
+    """Read build-system.requires from pyproject.toml
+    
+    Returns:
+        Build requirements, or setuptools and wheel if pyproject.toml is missing
+    """
+    try:
+        text = Path("pyproject.toml").read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return ["setuptools", "wheel"]
+    
+    try:
+        import tomllib  # Python 3.11+
+    except ImportError:
+        tomllib = None
+    
+    if tomllib is not None:
+        return tomllib.loads(text).get("build-system", {}).get("requires", [])
+    
+    # Older Pythons: pick the requires list out of the [build-system] table
+    match = re.search(r"^\[build-system\][^\[]*?^requires\s*=\s*\[(.*?)\]\s*$", text, re.M | re.S)
+    return re.findall(r"[\"']([^\"']+)[\"']", match.group(1)) if match else []
+
+def query_nvidia_smi(field):
+    """Read a field for the first GPU from nvidia-smi
+    
+    Returns:
+        Field value as a string, or None if nvidia-smi is missing or doesn't
+        know the field (older drivers lack compute_cap)
+    """
+    try:
+        result = subprocess.run(
+            ["nvidia-smi", f"--query-gpu={field}", "--format=csv,noheader"],
+            check=True, capture_output=True, text=True
+        )
+        return result.stdout.split()[0]
+    except (OSError, subprocess.CalledProcessError, IndexError):
+        return None
+
+def detect_cuda_index():
+    """Pick the PyTorch wheel index matching the local GPU and driver
+    
+    Returns:
+        Index URL, BG_REMOVER_TORCH_INDEX if set, the CPU index if no
+        NVIDIA GPU is found or the driver is too old for any CUDA wheel
+    """
+    override = os.environ.get("BG_REMOVER_TORCH_INDEX")
+    if override:
+        return override
+    
+    cpu_index = f"{TORCH_INDEX_BASE}/cpu"
+    driver_version = query_nvidia_smi("driver_version")
+    try:
+        driver = tuple(int(part) for part in driver_version.split(".")[:2])
+    except (AttributeError, ValueError):
+        return cpu_index
+    
+    try:
+        compute_cap = float(query_nvidia_smi("compute_cap"))
+    except (TypeError, ValueError):
+        compute_cap = None
+    
+    # Newest wheel the driver (and, if known, the GPU) supports
+    windows = platform.system() == "Windows"
+    for tag, min_driver_linux, min_driver_windows, min_cap in CUDA_WHEEL_TAGS:
+        if driver < (min_driver_windows if windows else min_driver_linux):
+            continue
+        if compute_cap is not None and compute_cap < min_cap:
+            continue
+        return f"{TORCH_INDEX_BASE}/{tag}"
+    return cpu_index
+
+def get_pytorch_command():
+    """Build the pip command that installs PyTorch"""
+    index_url = detect_cuda_index()
+    print(f"Using PyTorch index {index_url} (override with BG_REMOVER_TORCH_INDEX)")
+    pytorch_cmd = PIP_INSTALL + ["torch", "torchvision", "--index-url", index_url]
+    # The torch wheels are large, make sure they land in the persistent cache
+    pytorch_cmd += ["--cache-dir", PIP_CACHE_DIR]
+    return pytorch_cmd
 
 def main():
     """Setup development environment"""
@@ -34,78 +231,69 @@ def main():
     
     print(f"✓ Python {sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}")
     
-    # Install development dependencies
+    # Upgrade pip and install the build requirements: wheel lets pip cache
+    # built packages, and the editable install below runs without build isolation
+    print("\nUpgrading pip and build requirements...")
+    if not run_command(PIP_INSTALL + ["--upgrade", "pip", "wheel", *read_build_requires()]):
+        print("Warning: Failed to upgrade pip")
+    
+    # Installs run one after another: pip takes no lock on site-packages and
+    # these groups share dependencies (Jinja2, filelock, typing-extensions)
     print("\nInstalling development dependencies...")
-    dev_packages = [
-        "pytest>=6.0.0",
-        "pytest-cov>=2.12.0",
-        "black>=21.0.0",
-        "flake8>=3.9.0",
-        "pre-commit>=2.15.0",
-        "sphinx>=4.0.0",
-        "sphinx-rtd-theme>=0.5.0",
-    ]
-    
-    for package in dev_packages:
-        if not run_command([sys.executable, "-m", "pip", "install", package]):
-            print(f"Failed to install {package}")
-            sys.exit(1)
+    failed = install_packages(DEV_PACKAGES)
+    if failed:
+        print(f"Failed to install {', '.join(failed)}")
+        sys.exit(1)
     
     # Install PyTorch
     print("\nInstalling PyTorch...")
-    if platform.system() == "Windows":
-        pytorch_cmd = [
-            sys.executable, "-m", "pip", "install", 
-            "torch", "torchvision", 
-            "--index-url", "https://download.pytorch.org/whl/cu121"
-        ]
-    else:
-        pytorch_cmd = [sys.executable, "-m", "pip", "install", "torch", "torchvision"]
-    
-    if not run_command(pytorch_cmd):
+    if not run_command(get_pytorch_command()):
         print("Failed to install PyTorch")
         sys.exit(1)
     
-    # Install model dependencies
+    # Install model dependencies (kornia needs torch, so they follow it)
     print("\nInstalling model dependencies...")
-    model_packages = [
-        "transparent-background==1.2.5 --no-deps",
-        "easydict", "kornia", "opencv-python", "pyvirtualcam",
-        "rembg>=2.0.0"
-    ]
-    
-    for package in model_packages:
-        cmd = [sys.executable, "-m", "pip", "install"] + package.split()
-        if not run_command(cmd):
-            print(f"Warning: Failed to install {package}")
+    for package in install_packages(MODEL_PACKAGES):
+        print(f"Warning: Failed to install {package}")
     
     # Install package in development mode
     print("\nInstalling bg-remover in development mode...")
-    if not run_command([sys.executable, "-m", "pip", "install", "-e", "."]):
+    if not run_command(PIP_INSTALL + ["--no-build-isolation", "-e", "."]):
         print("Failed to install bg-remover")
         sys.exit(1)
     
     # Setup pre-commit hooks
     print("\nSetting up pre-commit hooks...")
-    if not run_command(["pre-commit", "install"]):
+    if Path(".git/hooks/pre-commit").exists():
+        print("✓ pre-commit hooks already installed")
+    elif not run_command(["pre-commit", "install"]):
         print("Failed to setup pre-commit hooks")
     
     # Create development directories
     print("\nCreating development directories...")
-    dirs = ["test_images", "test_output", "docs/build", "logs"]
-    for dir_name in dirs:
-        Path(dir_name).mkdir(parents=True, exist_ok=True)
-        print(f"✓ Created {dir_name}/")
+    for dir_name in ["test_images", "test_output", "docs/build", "logs"]:
+        path = Path(dir_name)
+        if path.is_dir():
+            print(f"✓ {dir_name}/ exists")
+        else:
+            path.mkdir(parents=True, exist_ok=True)
+            print(f"✓ Created {dir_name}/")
     
-    # Test installation
+    # Test installation (skipped if it already passed for this Python and version)
     print("\nTesting installation...")
-    if not run_command(["bg-remover", "info"]):
+    stamp = get_setup_stamp()
+    marker = Path(SETUP_MARKER)
+    if stamp is not None and marker.is_file() and marker.read_text(encoding="utf-8") == stamp:
+        print("✓ Installation already verified")
+    elif not run_command(["bg-remover", "info"]):
         print("Installation test failed")
         sys.exit(1)
+    elif stamp is not None:
+        marker.write_text(stamp, encoding="utf-8")
     
     print("\n🎉 Development environment setup completed successfully!")
     print("\nNext steps:")
-    print("1. Run tests: pytest tests/")
+    print("1. Run tests: pytest -n auto tests/")
     print("2. Format code: black bg_remover/")
     print("3. Lint code: flake8 bg_remover/")
     print("4. Build docs: cd docs && make html")
@@ -1,6 +1,8 @@
 from setuptools import setup, find_packages
 import os
+import re
 import sys
+from pathlib import Path
 
 # Read README for long description
 def read_readme():
@@ -10,40 +12,44 @@ def read_readme():
     except FileNotFoundError:
         return "Professional background removal application with automatic folder monitoring"
 
+# Fallback requirements if requirements.txt is not found
+FALLBACK_REQUIREMENTS = [
+    "torch>=1.9.0",
+    "torchvision>=0.10.0",
+    "opencv-python>=4.5.0",
+    "Pillow>=8.0.0",
+    "numpy>=1.21.0",
+    "watchdog>=2.1.0",
+    "pyyaml>=6.0",
+    "click>=8.0.0",
+    "tqdm>=4.62.0",
+    "psutil>=5.8.0",
+    "easydict>=1.9",
+    "kornia>=0.6.0",
+    "pyvirtualcam>=0.6.0",
+    "rembg>=2.0.0",
+    "onnxruntime>=1.12.0",
+    "transparent-background>=1.2.5",
+]
+
+_REQS = None
+
 # Read requirements with special handling for problematic packages
 def read_requirements():
-    requirements = []
+    global _REQS
+    if _REQS is not None:
+        return _REQS
+    
     try:
-        with open("requirements.txt", "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    # Handle special cases for problematic packages
-                    if "transparent-background" in line:
-                        requirements.append("transparent-background>=1.2.5")
-                    else:
-                        requirements.append(line)
+        text = Path("requirements.txt").read_text(encoding="utf-8")
     except FileNotFoundError:
-        # Fallback requirements if file not found
-        requirements = [
-            "torch>=1.9.0",
-            "torchvision>=0.10.0",
-            "opencv-python>=4.5.0",
-            "Pillow>=8.0.0",
-            "numpy>=1.21.0",
-            "watchdog>=2.1.0",
-            "pyyaml>=6.0",
-            "click>=8.0.0",
-            "tqdm>=4.62.0",
-            "psutil>=5.8.0",
-            "easydict>=1.9",
-            "kornia>=0.6.0",
-            "pyvirtualcam>=0.6.0",
-            "rembg>=2.0.0",
-            "onnxruntime>=1.12.0",
-            "transparent-background>=1.2.5",
-        ]
-    return requirements
+        _REQS = list(FALLBACK_REQUIREMENTS)
+        return _REQS
+    
+    # Handle special cases for problematic packages
+    text = re.sub(r"^\s*transparent-background.*$", "transparent-background>=1.2.5", text, flags=re.M)
+    _REQS = [ln.strip() for ln in text.splitlines() if ln.strip() and not ln.lstrip().startswith("#")]
+    return _REQS
 
 setup(
     name="bg-remover",
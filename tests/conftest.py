@@ -0,0 +1,37 @@
+import copy
+from unittest.mock import patch
+
+import pytest
+
+from bg_remover.config import manager
+from bg_remover.config.manager import ConfigManager
+from bg_remover.core.processor import BackgroundProcessor
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_config_cache(tmp_path_factory):
+    """Keep pickled YAML configs out of the user's home directory"""
+    with patch.object(manager, "_BINARY_CACHE_DIR", tmp_path_factory.mktemp("config_cache")):
+        yield
+
+@pytest.fixture(scope="session")
+def base_config(isolated_config_cache):
+    """Default configuration, built once per session"""
+    return ConfigManager()
+
+@pytest.fixture(scope="session")
+def base_processor(base_config):
+    """Processor on the default configuration, built once per session"""
+    return BackgroundProcessor(base_config)
+
+@pytest.fixture
+def config(base_config):
+    """Per-test copy of the default configuration, safe to modify"""
+    return copy.deepcopy(base_config)
+
+@pytest.fixture
+def processor(base_processor, config):
+    """Per-test shallow copy of the processor, bound to its own config"""
+    processor = copy.copy(base_processor)
+    processor.config = config
+    processor.stats = type(base_processor.stats)()
+    return processor
@@ -1,9 +1,11 @@
-"""
+import datetime
 import pytest
 import tempfile
 import yaml
 from pathlib import Path
+from unittest.mock import patch
 
+from bg_remover.config import manager
 from bg_remover.config.manager import ConfigManager
 
 class TestConfigManager:
@@ -48,4 +50,49 @@ class TestConfigManager:
         
         config.set("new.nested.key", "value")
         assert config.get("new.nested.key") == "value"
-"""
\ No newline at end of file
+    
+    def test_file_changes_are_picked_up(self, tmp_path):
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("processing:\n  model: rembg\n")
+        assert ConfigManager(str(config_path)).get("processing.model") == "rembg"
+        
+        config_path.write_text("processing:\n  model: sam\n  device: cpu\n")
+        assert ConfigManager(str(config_path)).get("processing.model") == "sam"
+    
+    def test_save_invalidates_parse_cache(self, tmp_path):
+        config_path = tmp_path / "config.yaml"
+        config = ConfigManager(str(config_path))
+        
+        config.set("processing.model", "sam")
+        config.save()
+        
+        assert ConfigManager(str(config_path)).get("processing.model") == "sam"
+    
+    def test_set_invalidates_get_cache(self):
+        config = ConfigManager()
+        config.get("processing")
+        
+        config.set("processing.model", "test-model")
+        
+        assert config.get("processing")["model"] == "test-model"
+    
+    def test_yaml_binary_cache(self, tmp_path):
+        cache_dir = tmp_path / "cache"
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("processing:\n  model: rembg\n  since: 2024-01-02 03:04:05\n")
+        
+        with patch.object(manager, "_BINARY_CACHE_DIR", cache_dir):
+            ConfigManager(str(config_path))
+            assert len(list(cache_dir.glob("config-*.pkl"))) == 1
+            assert not list(tmp_path.glob("*.pkl"))
+            
+            # A second parse is served from the pickle, dates included
+            manager._PARSE_CACHE.clear()
+            with patch.object(manager.yaml, "load", side_effect=AssertionError("YAML parsed again")):
+                config = ConfigManager(str(config_path))
+            assert config.get("processing.since") == datetime.datetime(2024, 1, 2, 3, 4, 5)
+            
+            # Changed YAML content invalidates the pickle
+            manager._PARSE_CACHE.clear()
+            config_path.write_text("processing:\n  model: sam\n")
+            assert ConfigManager(str(config_path)).get("processing.model") == "sam"
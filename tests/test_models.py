@@ -1,4 +1,9 @@
-"""
+import hashlib
+import io
+import sys
+import threading
+import time
+import urllib.error
 import pytest
 from unittest.mock import Mock, patch
 import numpy as np
@@ -6,6 +11,7 @@ from PIL import Image
 
 from bg_remover.models.factory import ModelFactory
 from bg_remover.models.base import BaseModel
+from bg_remover.models.sam_model import SAMModel
 
 class TestModelFactory:
     def test_get_available_models(self):
@@ -32,18 +38,131 @@ class TestModelFactory:
         with pytest.raises(ValueError):
             ModelFactory.create_model("nonexistent-model")
 
+class DummyModel(BaseModel):
+    def initialize(self):
+        pass
+    def process_image(self, image):
+        return image
+    def cleanup(self):
+        pass
+
 class TestBaseModel:
     def test_device_resolution(self):
-        # Mock torch availability
-        with patch('torch.cuda.is_available', return_value=True):
-            model = BaseModel()
+        # Mock CUDA availability (the real probe is cached per process)
+        with patch('bg_remover.models.base.cuda_available', return_value=True):
+            model = DummyModel()
             assert model._resolve_device("auto") == "cuda"
         
-        with patch('torch.cuda.is_available', return_value=False):
-            model = BaseModel()
+        with patch('bg_remover.models.base.cuda_available', return_value=False):
+            model = DummyModel()
             assert model._resolve_device("auto") == "cpu"
         
-        model = BaseModel()
+        model = DummyModel()
         assert model._resolve_device("cpu") == "cpu"
         assert model._resolve_device("cuda") == "cuda"
-"""
\ No newline at end of file
+
+class FakeResponse:
+    """Minimal urlopen() response serving bytes"""
+    
+    def __init__(self, data, status=200, headers=None, delay=0):
+        self.status = status
+        self.headers = headers or {"Content-Length": str(len(data))}
+        self._data = io.BytesIO(data)
+        self._delay = delay
+    
+    def read(self, size=-1):
+        time.sleep(self._delay)
+        return self._data.read(size)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self._data.close()
+
+class TestSAMCheckpointDownload:
+    URL = "https://example.invalid/sam.pth"
+    DATA = b"0123456789" * 100
+    
+    def _download(self, checkpoint_path, sha256=None):
+        return SAMModel._download_checkpoint(self.URL, checkpoint_path, sha256)
+    
+    def test_fresh_download(self, tmp_path):
+        checkpoint = tmp_path / "sam.pth"
+        with patch("urllib.request.urlopen", return_value=FakeResponse(self.DATA)):
+            assert self._download(checkpoint) == str(checkpoint)
+        
+        assert checkpoint.read_bytes() == self.DATA
+        assert not checkpoint.with_name("sam.pth.part").exists()
+    
+    def test_resume_from_partial_file(self, tmp_path):
+        checkpoint = tmp_path / "sam.pth"
+        checkpoint.with_name("sam.pth.part").write_bytes(self.DATA[:300])
+        response = FakeResponse(self.DATA[300:], status=206,
+                                headers={"Content-Range": f"bytes 300-999/{len(self.DATA)}"})
+        
+        with patch("urllib.request.urlopen", return_value=response) as urlopen:
+            self._download(checkpoint, hashlib.sha256(self.DATA).hexdigest())
+        
+        assert urlopen.call_args[0][0].get_header("Range") == "bytes=300-"
+        assert checkpoint.read_bytes() == self.DATA
+    
+    def test_truncated_download_is_not_promoted(self, tmp_path):
+        checkpoint = tmp_path / "sam.pth"
+        response = FakeResponse(self.DATA[:500], headers={"Content-Length": str(len(self.DATA))})
+        
+        with patch("urllib.request.urlopen", return_value=response):
+            with pytest.raises(IOError):
+                self._download(checkpoint)
+        
+        assert not checkpoint.exists()
+        assert checkpoint.with_name("sam.pth.part").stat().st_size == 500
+    
+    def test_checksum_mismatch(self, tmp_path):
+        checkpoint = tmp_path / "sam.pth"
+        with patch("urllib.request.urlopen", return_value=FakeResponse(self.DATA)):
+            with pytest.raises(IOError, match="Checksum mismatch"):
+                self._download(checkpoint, "0" * 64)
+        
+        assert not checkpoint.exists()
+        assert not checkpoint.with_name("sam.pth.part").exists()
+    
+    def test_416_with_complete_partial_file(self, tmp_path):
+        checkpoint = tmp_path / "sam.pth"
+        checkpoint.with_name("sam.pth.part").write_bytes(self.DATA)
+        error = urllib.error.HTTPError(self.URL, 416, "Range Not Satisfiable",
+                                       {"Content-Range": f"bytes */{len(self.DATA)}"}, None)
+        
+        with patch("urllib.request.urlopen", side_effect=error):
+            self._download(checkpoint)
+        
+        assert checkpoint.read_bytes() == self.DATA
+    
+    def test_416_with_oversized_partial_file_restarts(self, tmp_path):
+        checkpoint = tmp_path / "sam.pth"
+        checkpoint.with_name("sam.pth.part").write_bytes(self.DATA + b"garbage")
+        error = urllib.error.HTTPError(self.URL, 416, "Range Not Satisfiable",
+                                       {"Content-Range": f"bytes */{len(self.DATA)}"}, None)
+        
+        with patch("urllib.request.urlopen", side_effect=[error, FakeResponse(self.DATA)]) as urlopen:
+            self._download(checkpoint)
+        
+        assert urlopen.call_count == 2
+        assert checkpoint.read_bytes() == self.DATA
+    
+    @pytest.mark.skipif(sys.platform == "win32", reason="download lock uses fcntl")
+    def test_concurrent_downloads_fetch_once(self, tmp_path):
+        checkpoint = tmp_path / "sam.pth"
+        
+        def urlopen(request):
+            return FakeResponse(self.DATA, delay=0.01)
+        
+        with patch("urllib.request.urlopen", side_effect=urlopen) as mock_urlopen:
+            threads = [threading.Thread(target=self._download, args=(checkpoint,)) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        assert mock_urlopen.call_count == 1
+        assert checkpoint.read_bytes() == self.DATA
@@ -0,0 +1,48 @@
+import time
+from pathlib import Path
+
+from bg_remover.core.monitor import DEBOUNCE_MAX_WAIT_FACTOR, FileEventHandler
+
+class TestFileEventHandler:
+    def _handler(self, config, batches, debounce, batch_size):
+        config.set("monitoring.debounce_seconds", debounce)
+        config.set("processing.batch_size", batch_size)
+        return FileEventHandler(batches.append, config)
+    
+    def test_quiet_period_flushes_batch(self, config):
+        batches = []
+        handler = self._handler(config, batches, 0.05, 0)
+        
+        handler._queue_file(Path("a.png"))
+        handler._queue_file(Path("b.png"))
+        time.sleep(0.3)
+        
+        assert batches == [[Path("a.png"), Path("b.png")]]
+    
+    def test_steady_stream_still_flushes(self, config):
+        debounce = 0.1
+        batches = []
+        handler = self._handler(config, batches, debounce, 0)
+        
+        # Events arrive faster than the debounce, so it never goes quiet
+        deadline = time.perf_counter() + debounce * DEBOUNCE_MAX_WAIT_FACTOR * 3
+        count = 0
+        while time.perf_counter() < deadline:
+            handler._queue_file(Path(f"{count}.png"))
+            count += 1
+            time.sleep(debounce / 4)
+        
+        assert batches, "no flush while events kept arriving"
+        handler.cancel_pending()
+        assert all(len(batch) < count for batch in batches)
+    
+    def test_full_batch_flushes_immediately(self, config):
+        batches = []
+        handler = self._handler(config, batches, 10.0, 3)
+        
+        for name in ["a.png", "b.png", "c.png"]:
+            handler._queue_file(Path(name))
+        
+        assert batches == [[Path("a.png"), Path("b.png"), Path("c.png")]]
+        assert not handler.pending_files
+        assert handler._flush_timer is None
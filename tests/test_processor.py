@@ -1,4 +1,3 @@
-"""
 import pytest
 import tempfile
 from pathlib import Path
@@ -7,6 +6,20 @@ from PIL import Image
 
 from bg_remover.config.manager import ConfigManager
 from bg_remover.core.processor import BackgroundProcessor
+from bg_remover.models.base import BaseModel
+from bg_remover.models.factory import ModelFactory
+
+class FailingSizeModel(BaseModel):
+    """Passes images through, except 9x9 ones which it rejects"""
+    
+    def initialize(self):
+        self._initialized = True
+    def process_image(self, image):
+        if image.size == (9, 9):
+            raise ValueError("unexpected shape")
+        return image.convert("RGBA")
+    def cleanup(self):
+        pass
 
 class TestBackgroundProcessor:
     def test_directory_setup(self):
@@ -22,26 +35,83 @@ class TestBackgroundProcessor:
             assert Path(f"{tmp_dir}/output").exists()
             assert Path(f"{tmp_dir}/processed").exists()
     
-    def test_supported_file_detection(self):
-        config = ConfigManager()
-        processor = BackgroundProcessor(config)
-        
+    def test_supported_file_detection(self, processor):
         assert processor._is_supported_file(Path("test.jpg"))
         assert processor._is_supported_file(Path("test.png"))
         assert not processor._is_supported_file(Path("test.txt"))
         assert not processor._is_supported_file(Path("test.pdf"))
     
     @patch('bg_remover.models.factory.ModelFactory.create_model')
-    def test_model_initialization(self, mock_create_model):
+    def test_model_initialization(self, mock_create_model, processor):
         mock_model = Mock()
         mock_create_model.return_value = mock_model
         
-        config = ConfigManager()
-        config.set("models.transparent-background.enabled", True)
-        
-        processor = BackgroundProcessor(config)
+        processor.config.set("models.transparent-background.enabled", True)
         processor._initialize_model()
         
         mock_create_model.assert_called_once()
         mock_model.initialize.assert_called_once()
-"""
\ No newline at end of file
+    
+    @patch('bg_remover.core.processor.ProcessPoolExecutor')
+    @patch('bg_remover.models.factory.ModelFactory.create_model')
+    def test_cpu_worker_pool(self, mock_create_model, mock_pool, processor):
+        mock_model = Mock()
+        mock_model.device = "cpu"
+        mock_create_model.return_value = mock_model
+        
+        processor.config.set("processing.model", "transparent-background")
+        processor.config.set("models.transparent-background.mode", "base-nightly")
+        processor.config.set("processing.batch_size", 8)
+        processor.config.set("processing.cpu_workers", 2)
+        processor._initialize_model()
+        
+        # Workers load the model themselves, with the full constructor options
+        mock_model.initialize.assert_not_called()
+        pool_kwargs = mock_pool.call_args.kwargs
+        assert pool_kwargs["max_workers"] == 2
+        assert pool_kwargs["initargs"][2]["mode"] == "base-nightly"
+        
+        processor._cleanup_model()
+        mock_pool.return_value.shutdown.assert_called_once_with(wait=True)
+    
+    @patch('bg_remover.core.processor.ProcessPoolExecutor')
+    @patch('bg_remover.models.factory.ModelFactory.create_model')
+    def test_cpu_batches_stay_in_process_by_default(self, mock_create_model, mock_pool, processor):
+        mock_model = Mock()
+        mock_model.device = "cpu"
+        mock_create_model.return_value = mock_model
+        
+        processor.config.set("processing.batch_size", 8)
+        processor._initialize_model()
+        
+        mock_pool.assert_not_called()
+        mock_model.initialize.assert_called_once()
+    
+    def test_batch_failure_only_fails_bad_image(self, tmp_path, monkeypatch):
+        # Registered for this test only
+        monkeypatch.setitem(ModelFactory._models, "failing-size", FailingSizeModel)
+        
+        config = ConfigManager(str(tmp_path / "config.yaml"))
+        config.set("processing.input_folder", str(tmp_path / "input"))
+        config.set("processing.output_folder", str(tmp_path / "output"))
+        config.set("processing.processed_folder", str(tmp_path / "processed"))
+        config.set("processing.file_stability_timeout", 0)
+        config.set("processing.batch_size", 3)
+        config.set("processing.model", "failing-size")
+        config.set("models.failing-size", {"enabled": True, "device": "cpu"})
+        
+        processor = BackgroundProcessor(config)
+        for name in ["a", "b", "c", "d"]:
+            Image.new("RGB", (8, 8)).save(tmp_path / "input" / f"{name}.png")
+        Image.new("RGB", (9, 9)).save(tmp_path / "input" / "bad.png")
+        
+        results = processor.process_folder()
+        
+        assert results["processed"] == 4
+        assert results["failed"] == 1
+        assert processor.stats.total_processed == 4
+        assert processor.stats.total_failed == 1
+        assert sorted(p.name for p in (tmp_path / "output").iterdir()) == [
+            f"{name}_failing-size_default_cpu.png" for name in ["a", "b", "c", "d"]
+        ]
+        assert [p.name for p in (tmp_path / "input").iterdir()] == ["bad.png"]
@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from bg_remover.core.statistics import ProcessingStats
+
+class TestProcessingStats:
+    def test_totals_across_threads(self):
+        stats = ProcessingStats()
+        
+        def record(offset):
+            for i in range(100):
+                stats.add_success(offset + i * 0.01, 10)
+            stats.add_failure(5)
+        
+        # Run more threads than are alive at once so finished shards get retired
+        for batch in range(3):
+            threads = [threading.Thread(target=record, args=(batch + t,)) for t in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        assert stats.total_processed == 1200
+        assert stats.total_failed == 12
+        assert stats.total_files == 1212
+        assert stats.total_file_size == 1200 * 10 + 12 * 5
+        
+        summary = stats.get_summary()
+        assert summary["min_processing_time"] == 0
+        assert summary["max_processing_time"] == round(5 + 0.99, 2)
+        assert summary["success_rate"] == round(1200 / 1212 * 100, 2)
+    
+    def test_reset(self):
+        stats = ProcessingStats()
+        stats.add_success(1.0, 100)
+        stats.add_failure(50)
+        
+        stats.reset()
+        
+        assert stats.total_files == 0
+        assert stats.total_file_size == 0
+        assert stats.get_summary()["min_processing_time"] == 0
+        
+        # The same thread keeps recording after reset
+        stats.add_success(2.0, 10)
+        assert stats.total_processed == 1
+        assert stats.average_processing_time == pytest.approx(2.0)
+    
+    def test_empty_stats(self):
+        stats = ProcessingStats()
+        
+        assert stats.success_rate == 0.0
+        assert stats.average_processing_time == 0.0
+        assert stats.files_per_second == 0.0
+        assert stats.total_runtime >= 0
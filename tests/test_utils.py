@@ -1,4 +1,3 @@
-"""
 import pytest
 from pathlib import Path
 import tempfile
@@ -42,4 +41,3 @@ class TestDeviceUtils:
         for key in required_keys:
             assert key in info
             assert info[key] is not None
-"""
\ No newline at end of file